@@ -2,16 +2,18 @@ from __future__ import annotations
 
 import csv
 import math
+from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, List, Tuple
 
 BTC_CSV = Path("data/btcusdt_1h_history.csv")
 HYPER_CSV = Path("data/hyperliquid_position_history.csv")
 OUTPUT_MD = Path("docs/smart_wallet_strategy_backtest.md")
 HOURS_PER_YEAR = 24 * 365
+SECONDS_PER_HOUR = 60 * 60
 COST_PER_TURNOVER = 0.0005  # 5 bps one-way
 TRAIN_RATIO = 0.7
 MIN_ACTIVE_HOURS = 8
@@ -41,75 +43,93 @@ class BacktestResult:
 
 def read_btc_data(path: Path) -> Dict[str, List[float]]:
     times: List[str] = []
+    hours: List[int] = []
     closes: List[float] = []
 
     with path.open() as f:
-        for row in csv.DictReader(f):
-            times.append(row["open_time_iso"])
-            closes.append(float(row["close"]))
+        reader = csv.reader(f)
+        header = next(reader)
+        time_i, ms_i, close_i = (header.index(name) for name in ("open_time_iso", "open_time_ms", "close"))
+        for row in reader:
+            times.append(row[time_i])
+            hours.append(int(row[ms_i]) // (SECONDS_PER_HOUR * 1000))
+            closes.append(float(row[close_i]))
 
-    return {"time": times, "close": closes}
+    return {"time": times, "hour": hours, "close": closes}
 
 
-def read_wallet_btc_hourly_flow(path: Path) -> Dict[str, Dict[str, float]]:
-    wallet_hour_flow: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+def read_wallet_btc_hourly_flow(path: Path) -> Dict[str, Dict[int, float]]:
+    wallet_hour_flow: Dict[str, Dict[int, float]] = defaultdict(lambda: defaultdict(float))
 
     with path.open() as f:
-        for row in csv.DictReader(f):
-            if row["symbol"] != "BTC":
+        reader = csv.reader(f)
+        header = next(reader)
+        wallet_i, ts_i, symbol_i, side_i, size_i, price_i = (
+            header.index(name) for name in ("wallet", "timestamp", "symbol", "fill_side", "fill_size", "fill_price")
+        )
+        for row in reader:
+            if row[symbol_i] != "BTC":
                 continue
-            wallet = row["wallet"]
-            ts = datetime.fromisoformat(row["timestamp"]).astimezone(timezone.utc)
-            hour = ts.replace(minute=0, second=0, microsecond=0).isoformat()
-            side = 1.0 if row["fill_side"].lower() == "buy" else -1.0
-            notional = float(row["fill_size"]) * float(row["fill_price"])
-            wallet_hour_flow[wallet][hour] += side * notional
+            hour = utc_hour_id(row[ts_i])
+            side = 1.0 if row[side_i].lower() == "buy" else -1.0
+            notional = float(row[size_i]) * float(row[price_i])
+            wallet_hour_flow[row[wallet_i]][hour] += side * notional
 
     return {wallet: dict(hour_map) for wallet, hour_map in wallet_hour_flow.items()}
 
 
+def utc_hour_id(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp).timestamp()) // SECONDS_PER_HOUR
+
+
 def returns_from_close(closes: List[float]) -> List[float]:
-    rets = [0.0] * len(closes)
-    for i in range(1, len(closes)):
-        rets[i] = closes[i] / closes[i - 1] - 1.0
-    return rets
+    return [0.0] + [cur / prev - 1.0 for prev, cur in zip(closes, closes[1:])]
 
 
 def run_backtest(closes: List[float], signal: List[int], cost: float = COST_PER_TURNOVER) -> BacktestResult:
     if len(closes) != len(signal):
         raise ValueError("closes and signal must be same length")
-
-    rets = returns_from_close(closes)
-    n = len(closes)
-    position = [0] * n
-    strat_rets = [0.0] * n
-
-    for i in range(1, n):
-        position[i] = signal[i - 1]  # one-bar delay
-        turnover = abs(position[i] - position[i - 1])
-        strat_rets[i] = position[i] * rets[i] - turnover * cost
-
-    equity = [1.0]
+    return backtest_returns(returns_from_close(closes), signal, cost)
+
+
+def backtest_returns(rets: List[float], signal: List[int], cost: float = COST_PER_TURNOVER) -> BacktestResult:
+    # rets[i] is the close-to-close return into bar i; rets[0] is ignored, so
+    # slices of one precomputed return series can be backtested directly.
+    if len(rets) != len(signal):
+        raise ValueError("rets and signal must be same length")
+
+    n = len(rets)
+    position = [0] + signal[:-1]  # one-bar delay
+    strat_rets = [0.0] + [
+        pos * ret - abs(pos - prev_pos) * cost for prev_pos, pos, ret in zip(position, position[1:], rets[1:])
+    ]
+
+    # Single pass over the returns for the equity curve and running peak;
+    # only the final scalars are kept.
+    equity = 1.0
+    peak = 1.0
+    trough_ratio = 1.0
     for r in strat_rets[1:]:
-        equity.append(equity[-1] * (1.0 + r))
+        equity *= 1.0 + r
+        if equity > peak:
+            peak = equity
+        elif equity / peak < trough_ratio:
+            trough_ratio = equity / peak
+    max_dd = trough_ratio - 1.0
 
     periods = max(1, n - 1)
     years = periods / HOURS_PER_YEAR
-    total_return = equity[-1] - 1.0
-    cagr = equity[-1] ** (1.0 / years) - 1.0 if years > 0 else 0.0
+    total_return = equity - 1.0
+    cagr = equity ** (1.0 / years) - 1.0 if years > 0 else 0.0
 
-    mean_ret = sum(strat_rets[1:]) / periods
-    std_ret = math.sqrt(sum((r - mean_ret) ** 2 for r in strat_rets[1:]) / periods)
+    # Hourly returns are tiny relative to their running total, so use exact
+    # summation for the moments that feed the Sharpe ratio.
+    mean_ret = math.fsum(strat_rets[1:]) / periods
+    std_ret = math.sqrt(math.fsum((r - mean_ret) ** 2 for r in strat_rets[1:]) / periods)
     sharpe = (mean_ret / std_ret) * math.sqrt(HOURS_PER_YEAR) if std_ret > 0 else 0.0
 
-    peak = equity[0]
-    max_dd = 0.0
-    for v in equity:
-        peak = max(peak, v)
-        max_dd = min(max_dd, (v / peak) - 1.0)
-
     trades, win_rate = trade_stats(position, strat_rets)
-    exposure = sum(abs(p) for p in position) / len(position)
+    exposure = (len(position) - position.count(0)) / len(position)
 
     return BacktestResult(
         total_return=total_return,
@@ -128,20 +148,20 @@ def trade_stats(position: List[int], strat_rets: List[float]) -> Tuple[int, floa
     in_trade = False
     current_pnl = 0.0
 
-    for i in range(1, len(position)):
-        if position[i] != 0 and position[i - 1] == 0:
+    for prev_pos, pos, ret in zip(position, position[1:], strat_rets[1:]):
+        if pos != 0 and prev_pos == 0:
             trades += 1
             in_trade = True
-            current_pnl = strat_rets[i]
-        elif position[i] != 0 and position[i] != position[i - 1]:
+            current_pnl = ret
+        elif pos != 0 and pos != prev_pos:
             if in_trade and current_pnl > 0:
                 wins += 1
             trades += 1
-            current_pnl = strat_rets[i]
-        elif position[i] != 0 and in_trade:
-            current_pnl += strat_rets[i]
-        elif position[i] == 0 and position[i - 1] != 0 and in_trade:
-            current_pnl += strat_rets[i]
+            current_pnl = ret
+        elif pos != 0 and in_trade:
+            current_pnl += ret
+        elif pos == 0 and prev_pos != 0 and in_trade:
+            current_pnl += ret
             if current_pnl > 0:
                 wins += 1
             in_trade = False
@@ -153,38 +173,36 @@ def trade_stats(position: List[int], strat_rets: List[float]) -> Tuple[int, floa
     return trades, (wins / trades if trades > 0 else 0.0)
 
 
-def wallet_flow_signal(flow: float) -> int:
-    if flow > 0:
-        return 1
-    if flow < 0:
-        return -1
-    return 0
+def wallet_sign_series(flow_by_hour: Dict[int, float], hour_index: Dict[int, int], n: int) -> List[int]:
+    signs = [0] * n
+    for hour, flow in flow_by_hour.items():
+        i = hour_index.get(hour)
+        if i is not None:
+            signs[i] = (flow > 0) - (flow < 0)  # buy=+1, sell=-1, no flow=0
+    return signs
 
 
 def evaluate_wallet(
     wallet: str,
-    flow_by_hour: Dict[str, float],
-    times: List[str],
-    closes: List[float],
+    wallet_signal: List[int],
+    rets: List[float],
     train_end_idx: int,
 ) -> WalletStat | None:
-    wallet_signal = [wallet_flow_signal(flow_by_hour.get(ts, 0.0)) for ts in times]
-    active_hours = sum(1 for s in wallet_signal[:train_end_idx] if s != 0)
+    train_signal = wallet_signal[:train_end_idx]
+    active_hours = len(train_signal) - train_signal.count(0)
 
     if active_hours < MIN_ACTIVE_HOURS:
         return None
 
-    train_bt = run_backtest(closes[:train_end_idx], wallet_signal[:train_end_idx])
-    rets = returns_from_close(closes)
+    train_bt = backtest_returns(rets[:train_end_idx], train_signal)
 
     correct = 0
     total = 0
-    for i in range(1, train_end_idx):
-        prev_sig = wallet_signal[i - 1]
+    for prev_sig, ret in zip(train_signal, rets[1:train_end_idx]):
         if prev_sig == 0:
             continue
         total += 1
-        if prev_sig * rets[i] > 0:
+        if prev_sig * ret > 0:
             correct += 1
 
     hit_rate = correct / total if total > 0 else 0.0
@@ -202,41 +220,50 @@ def evaluate_wallet(
 
 
 def build_combined_signal(
-    wallet_stats: Iterable[WalletStat],
-    wallet_flow: Dict[str, Dict[str, float]],
-    times: List[str],
+    wallet_weights: Dict[str, float],
+    wallet_flow: Dict[str, Dict[int, float]],
+    hours: List[int],
     threshold: float,
 ) -> List[int]:
-    stats = list(wallet_stats)
-    total_weight = sum(w.weight for w in stats)
+    total_weight = sum(wallet_weights.values())
     if total_weight <= 0:
-        return [0] * len(times)
+        return [0] * len(hours)
 
-    norm_weights = {w.wallet: w.weight / total_weight for w in stats}
-    signal = [0] * len(times)
+    norm_weights = {wallet: weight / total_weight for wallet, weight in wallet_weights.items()}
+    hour_index = {hour: i for i, hour in enumerate(hours)}
+    scores = [0.0] * len(hours)
 
-    for i, ts in enumerate(times):
-        score = 0.0
-        for wallet, w in norm_weights.items():
-            score += w * wallet_flow_signal(wallet_flow[wallet].get(ts, 0.0))
-        if score > threshold:
-            signal[i] = 1
-        elif score < -threshold:
-            signal[i] = -1
+    # Wallets only trade in a small fraction of hours, so accumulate each
+    # wallet's active hours instead of probing every (wallet, hour) pair.
+    for wallet, w in norm_weights.items():
+        for hour, flow in wallet_flow[wallet].items():
+            i = hour_index.get(hour)
+            if i is not None:
+                scores[i] += w * ((flow > 0) - (flow < 0))
 
-    return signal
+    return [1 if score > threshold else -1 if score < -threshold else 0 for score in scores]
 
 
 def format_pct(v: float) -> str:
-    return f"{v * 100:.2f}%"
+    return f"{v:.2%}"
+
+
+def backtest_row(name: str, result: BacktestResult) -> str:
+    return (
+        f"| {name} | {format_pct(result.total_return)} | {format_pct(result.cagr)} | {result.sharpe:.2f} | "
+        f"{format_pct(result.max_drawdown)} | {result.trades} | {format_pct(result.win_rate)} | {format_pct(result.exposure)} |"
+    )
 
 
 def select_wallets(
-    wallet_flow: Dict[str, Dict[str, float]], times: List[str], closes: List[float], train_end_idx: int
+    wallet_flow: Dict[str, Dict[int, float]], hours: List[int], closes: List[float], train_end_idx: int
 ) -> List[WalletStat]:
+    hour_index = {hour: i for i, hour in enumerate(hours)}
+    rets = returns_from_close(closes)
     stats: List[WalletStat] = []
     for wallet, flow in wallet_flow.items():
-        s = evaluate_wallet(wallet, flow, times, closes, train_end_idx)
+        wallet_signal = wallet_sign_series(flow, hour_index, len(hours))
+        s = evaluate_wallet(wallet, wallet_signal, rets, train_end_idx)
         if s is not None:
             stats.append(s)
 
@@ -248,33 +275,37 @@ def select_wallets(
 def write_report(
     output: Path,
     times: List[str],
+    hours: List[int],
     closes: List[float],
     selected_wallets: List[WalletStat],
     threshold: float,
     train_end_idx: int,
-    wallet_flow: Dict[str, Dict[str, float]],
+    wallet_flow: Dict[str, Dict[int, float]],
 ) -> None:
     start = times[0]
     end = times[-1]
     n = len(times)
 
-    weighted_signal = build_combined_signal(selected_wallets, wallet_flow, times, threshold)
-    equal_wallets = [WalletStat(**{**w.__dict__, "weight": 1.0}) for w in selected_wallets]
-    equal_signal = build_combined_signal(equal_wallets, wallet_flow, times, threshold)
+    quality_weights = {w.wallet: w.weight for w in selected_wallets}
+    weighted_signal = build_combined_signal(quality_weights, wallet_flow, hours, threshold)
+    equal_signal = build_combined_signal(dict.fromkeys(quality_weights, 1.0), wallet_flow, hours, threshold)
     buy_hold_signal = [1] * len(closes)
 
-    full_weighted = run_backtest(closes, weighted_signal)
-    full_equal = run_backtest(closes, equal_signal)
-    full_buy_hold = run_backtest(closes, buy_hold_signal, cost=0.0)
+    rets = returns_from_close(closes)
+    full_weighted = backtest_returns(rets, weighted_signal)
+    full_equal = backtest_returns(rets, equal_signal)
+    full_buy_hold = backtest_returns(rets, buy_hold_signal, cost=0.0)
 
-    oos_closes = closes[train_end_idx - 1 :]
+    # The OOS run starts flat at bar train_end_idx - 1; its returns are the
+    # full-series returns from train_end_idx onwards.
+    oos_rets = [0.0] + rets[train_end_idx:]
     oos_weighted_signal = weighted_signal[train_end_idx - 1 :]
     oos_equal_signal = equal_signal[train_end_idx - 1 :]
-    oos_buy_hold = [1] * len(oos_closes)
+    oos_buy_hold = [1] * len(oos_rets)
 
-    oos_weighted = run_backtest(oos_closes, oos_weighted_signal)
-    oos_equal = run_backtest(oos_closes, oos_equal_signal)
-    oos_bh = run_backtest(oos_closes, oos_buy_hold, cost=0.0)
+    oos_weighted = backtest_returns(oos_rets, oos_weighted_signal)
+    oos_equal = backtest_returns(oos_rets, oos_equal_signal)
+    oos_bh = backtest_returns(oos_rets, oos_buy_hold, cost=0.0)
 
     lines: List[str] = []
     lines.append("# Smart Wallet BTC Strategy & Backtest")
@@ -312,29 +343,17 @@ def write_report(
     lines.append("### Full period")
     lines.append("| Strategy | Total Return | CAGR | Sharpe | Max Drawdown | Trades | Win Rate | Exposure |")
     lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
-    lines.append(
-        f"| Weighted smart-wallet consensus | {format_pct(full_weighted.total_return)} | {format_pct(full_weighted.cagr)} | {full_weighted.sharpe:.2f} | {format_pct(full_weighted.max_drawdown)} | {full_weighted.trades} | {format_pct(full_weighted.win_rate)} | {format_pct(full_weighted.exposure)} |"
-    )
-    lines.append(
-        f"| Equal-weight selected wallets | {format_pct(full_equal.total_return)} | {format_pct(full_equal.cagr)} | {full_equal.sharpe:.2f} | {format_pct(full_equal.max_drawdown)} | {full_equal.trades} | {format_pct(full_equal.win_rate)} | {format_pct(full_equal.exposure)} |"
-    )
-    lines.append(
-        f"| Buy & hold BTC (no costs) | {format_pct(full_buy_hold.total_return)} | {format_pct(full_buy_hold.cagr)} | {full_buy_hold.sharpe:.2f} | {format_pct(full_buy_hold.max_drawdown)} | {full_buy_hold.trades} | {format_pct(full_buy_hold.win_rate)} | {format_pct(full_buy_hold.exposure)} |"
-    )
+    lines.append(backtest_row("Weighted smart-wallet consensus", full_weighted))
+    lines.append(backtest_row("Equal-weight selected wallets", full_equal))
+    lines.append(backtest_row("Buy & hold BTC (no costs)", full_buy_hold))
 
     lines.append("")
     lines.append("### Out-of-sample period (last 30%)")
     lines.append("| Strategy | Total Return | CAGR | Sharpe | Max Drawdown | Trades | Win Rate | Exposure |")
     lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
-    lines.append(
-        f"| Weighted smart-wallet consensus | {format_pct(oos_weighted.total_return)} | {format_pct(oos_weighted.cagr)} | {oos_weighted.sharpe:.2f} | {format_pct(oos_weighted.max_drawdown)} | {oos_weighted.trades} | {format_pct(oos_weighted.win_rate)} | {format_pct(oos_weighted.exposure)} |"
-    )
-    lines.append(
-        f"| Equal-weight selected wallets | {format_pct(oos_equal.total_return)} | {format_pct(oos_equal.cagr)} | {oos_equal.sharpe:.2f} | {format_pct(oos_equal.max_drawdown)} | {oos_equal.trades} | {format_pct(oos_equal.win_rate)} | {format_pct(oos_equal.exposure)} |"
-    )
-    lines.append(
-        f"| Buy & hold BTC (no costs) | {format_pct(oos_bh.total_return)} | {format_pct(oos_bh.cagr)} | {oos_bh.sharpe:.2f} | {format_pct(oos_bh.max_drawdown)} | {oos_bh.trades} | {format_pct(oos_bh.win_rate)} | {format_pct(oos_bh.exposure)} |"
-    )
+    lines.append(backtest_row("Weighted smart-wallet consensus", oos_weighted))
+    lines.append(backtest_row("Equal-weight selected wallets", oos_equal))
+    lines.append(backtest_row("Buy & hold BTC (no costs)", oos_bh))
 
     lines.append("")
     lines.append("## 5) Interpretation")
@@ -349,20 +368,22 @@ def write_report(
 def main() -> None:
     btc = read_btc_data(BTC_CSV)
     times = btc["time"]
+    hours = btc["hour"]
     closes = btc["close"]
     wallet_flow = read_wallet_btc_hourly_flow(HYPER_CSV)
 
     overlap_start = min(min(flows.keys()) for flows in wallet_flow.values() if flows)
-    start_idx = next(i for i, ts in enumerate(times) if ts >= overlap_start)
+    start_idx = bisect_left(hours, overlap_start)
 
     times = times[start_idx:]
+    hours = hours[start_idx:]
     closes = closes[start_idx:]
 
     train_end_idx = int(len(times) * TRAIN_RATIO)
-    selected = select_wallets(wallet_flow, times, closes, train_end_idx)
+    selected = select_wallets(wallet_flow, hours, closes, train_end_idx)
     threshold = 0.20
 
-    write_report(OUTPUT_MD, times, closes, selected, threshold, train_end_idx, wallet_flow)
+    write_report(OUTPUT_MD, times, hours, closes, selected, threshold, train_end_idx, wallet_flow)
     print(f"Report written to {OUTPUT_MD}")
 
 
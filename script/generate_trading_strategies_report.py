@@ -4,7 +4,7 @@ import csv
 import math
 from collections import deque, defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple
 
@@ -12,6 +12,7 @@ BTC_CSV = Path("data/btcusdt_1h_history.csv")
 HYPER_CSV = Path("data/hyperliquid_position_history.csv")
 OUTPUT_MD = Path("docs/trading_strategies_report.md")
 HOURS_PER_YEAR = 24 * 365
+SECONDS_PER_HOUR = 60 * 60
 COST_PER_TURNOVER = 0.0005  # 5 bps one-way
 
 
@@ -24,6 +25,7 @@ class StrategyResult:
 
 def read_btc_data(path: Path) -> Dict[str, List[float]]:
     times: List[str] = []
+    hours: List[int] = []
     closes: List[float] = []
     highs: List[float] = []
     lows: List[float] = []
@@ -31,16 +33,24 @@ def read_btc_data(path: Path) -> Dict[str, List[float]]:
     taker_buy_base: List[float] = []
 
     with path.open() as f:
-        for row in csv.DictReader(f):
-            times.append(row["open_time_iso"])
-            closes.append(float(row["close"]))
-            highs.append(float(row["high"]))
-            lows.append(float(row["low"]))
-            volumes.append(float(row["volume"]))
-            taker_buy_base.append(float(row["taker_buy_base_volume"]))
+        reader = csv.reader(f)
+        header = next(reader)
+        time_i, ms_i, close_i, high_i, low_i, volume_i, taker_i = (
+            header.index(name)
+            for name in ("open_time_iso", "open_time_ms", "close", "high", "low", "volume", "taker_buy_base_volume")
+        )
+        for row in reader:
+            times.append(row[time_i])
+            hours.append(int(row[ms_i]) // (SECONDS_PER_HOUR * 1000))
+            closes.append(float(row[close_i]))
+            highs.append(float(row[high_i]))
+            lows.append(float(row[low_i]))
+            volumes.append(float(row[volume_i]))
+            taker_buy_base.append(float(row[taker_i]))
 
     return {
         "time": times,
+        "hour": hours,
         "close": closes,
         "high": highs,
         "low": lows,
@@ -49,72 +59,100 @@ def read_btc_data(path: Path) -> Dict[str, List[float]]:
     }
 
 
-def read_hyper_hourly_flow(path: Path) -> Dict[str, float]:
-    hourly_flow_usd: Dict[str, float] = defaultdict(float)
+def read_hyper_hourly_flow(path: Path) -> Dict[int, float]:
+    hourly_flow_usd: Dict[int, float] = defaultdict(float)
 
     with path.open() as f:
-        for row in csv.DictReader(f):
-            if row["symbol"] != "BTC":
+        reader = csv.reader(f)
+        header = next(reader)
+        ts_i, symbol_i, side_i, size_i, price_i = (
+            header.index(name) for name in ("timestamp", "symbol", "fill_side", "fill_size", "fill_price")
+        )
+        for row in reader:
+            if row[symbol_i] != "BTC":
                 continue
-            ts = datetime.fromisoformat(row["timestamp"])
-            ts_hour = ts.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0).isoformat()
-            side = 1.0 if row["fill_side"].lower() == "buy" else -1.0
-            notional = float(row["fill_size"]) * float(row["fill_price"])
+            ts_hour = utc_hour_id(row[ts_i])
+            side = 1.0 if row[side_i].lower() == "buy" else -1.0
+            notional = float(row[size_i]) * float(row[price_i])
             hourly_flow_usd[ts_hour] += side * notional
 
     return dict(hourly_flow_usd)
 
 
+def utc_hour_id(timestamp: str) -> int:
+    return int(datetime.fromisoformat(timestamp).timestamp()) // SECONDS_PER_HOUR
+
+
 def rolling_mean(values: List[float], window: int) -> List[float | None]:
     out: List[float | None] = [None] * len(values)
-    q: deque[float] = deque()
     running = 0.0
     for i, v in enumerate(values):
-        q.append(v)
         running += v
-        if len(q) > window:
-            running -= q.popleft()
-        if len(q) == window:
+        if i >= window:
+            running -= values[i - window]
+        if i >= window - 1:
             out[i] = running / window
     return out
 
 
 def rolling_std(values: List[float], window: int) -> List[float | None]:
     out: List[float | None] = [None] * len(values)
-    q: deque[float] = deque()
     running = 0.0
     running_sq = 0.0
     for i, v in enumerate(values):
-        q.append(v)
         running += v
         running_sq += v * v
-        if len(q) > window:
-            old = q.popleft()
+        if i >= window:
+            old = values[i - window]
             running -= old
             running_sq -= old * old
-        if len(q) == window:
+        if i >= window - 1:
             mean = running / window
             var = max((running_sq / window) - (mean * mean), 0.0)
             out[i] = math.sqrt(var)
     return out
 
 
+def rolling_max(values: List[float], window: int) -> List[float | None]:
+    out: List[float | None] = [None] * len(values)
+    q: deque[int] = deque()  # indices with strictly decreasing values
+    for i, v in enumerate(values):
+        while q and values[q[-1]] <= v:
+            q.pop()
+        q.append(i)
+        if q[0] <= i - window:
+            q.popleft()
+        if i >= window - 1:
+            out[i] = values[q[0]]
+    return out
+
+
+def rolling_min(values: List[float], window: int) -> List[float | None]:
+    out: List[float | None] = [None] * len(values)
+    q: deque[int] = deque()  # indices with strictly increasing values
+    for i, v in enumerate(values):
+        while q and values[q[-1]] >= v:
+            q.pop()
+        q.append(i)
+        if q[0] <= i - window:
+            q.popleft()
+        if i >= window - 1:
+            out[i] = values[q[0]]
+    return out
+
+
 def compute_rsi(closes: List[float], period: int = 14) -> List[float | None]:
     rsi: List[float | None] = [None] * len(closes)
-    gains = [0.0] * len(closes)
-    losses = [0.0] * len(closes)
-
-    for i in range(1, len(closes)):
-        delta = closes[i] - closes[i - 1]
-        gains[i] = max(delta, 0.0)
-        losses[i] = max(-delta, 0.0)
+    deltas = [cur - prev for prev, cur in zip(closes, closes[1:])]
+    gains = [0.0] + [max(delta, 0.0) for delta in deltas]
+    losses = [0.0] + [max(-delta, 0.0) for delta in deltas]
 
     avg_gain = sum(gains[1 : period + 1]) / period
     avg_loss = sum(losses[1 : period + 1]) / period
 
-    for i in range(period + 1, len(closes)):
-        avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
-        avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
+    for i, gain, loss in zip(range(period + 1, len(closes)), gains[period + 1 :], losses[period + 1 :]):
+        avg_gain = ((avg_gain * (period - 1)) + gain) / period
+        avg_loss = ((avg_loss * (period - 1)) + loss) / period
         if avg_loss == 0:
             rsi[i] = 100.0
         else:
@@ -125,10 +163,7 @@ def compute_rsi(closes: List[float], period: int = 14) -> List[float | None]:
 
 
 def returns_from_close(closes: List[float]) -> List[float]:
-    rets = [0.0] * len(closes)
-    for i in range(1, len(closes)):
-        rets[i] = closes[i] / closes[i - 1] - 1.0
-    return rets
+    return [0.0] + [cur / prev - 1.0 for prev, cur in zip(closes, closes[1:])]
 
 
 def run_backtest(closes: List[float], signal: List[int], cost: float = COST_PER_TURNOVER) -> Dict[str, float]:
@@ -136,38 +171,38 @@ def run_backtest(closes: List[float], signal: List[int], cost: float = COST_PER_
     rets = returns_from_close(closes)
     n = len(closes)
 
-    position = [0] * n
-    strategy_rets = [0.0] * n
+    position = [0] + signal[:-1]
+    strategy_rets = [0.0] + [
+        pos * ret - abs(pos - prev_pos) * cost for prev_pos, pos, ret in zip(position, position[1:], rets[1:])
+    ]
 
-    for t in range(1, n):
-        position[t] = signal[t - 1]
-        turnover = abs(position[t] - position[t - 1])
-        strategy_rets[t] = position[t] * rets[t] - turnover * cost
-
-    equity = [1.0]
+    # Single pass over the returns for the equity curve and running peak;
+    # only the final scalars are kept.
+    equity = 1.0
+    peak = 1.0
+    trough_ratio = 1.0
     for r in strategy_rets[1:]:
-        equity.append(equity[-1] * (1.0 + r))
-
-    total_return = equity[-1] - 1.0
+        equity *= 1.0 + r
+        if equity > peak:
+            peak = equity
+        elif equity / peak < trough_ratio:
+            trough_ratio = equity / peak
+    max_dd = trough_ratio - 1.0
+
+    total_return = equity - 1.0
     periods = max(n - 1, 1)
     years = periods / HOURS_PER_YEAR
-    cagr = equity[-1] ** (1.0 / years) - 1.0 if years > 0 else 0.0
+    cagr = equity ** (1.0 / years) - 1.0 if years > 0 else 0.0
 
-    mean_ret = sum(strategy_rets[1:]) / periods
-    std_ret = math.sqrt(sum((r - mean_ret) ** 2 for r in strategy_rets[1:]) / periods)
+    # Hourly returns are tiny relative to their running total, so use exact
+    # summation for the moments that feed the Sharpe ratio.
+    mean_ret = math.fsum(strategy_rets[1:]) / periods
+    std_ret = math.sqrt(math.fsum((r - mean_ret) ** 2 for r in strategy_rets[1:]) / periods)
     sharpe = (mean_ret / std_ret) * math.sqrt(HOURS_PER_YEAR) if std_ret > 0 else 0.0
 
-    peak = equity[0]
-    max_dd = 0.0
-    for v in equity:
-        if v > peak:
-            peak = v
-        dd = (v / peak) - 1.0
-        max_dd = min(max_dd, dd)
-
     trades, win_rate = trade_stats(position, strategy_rets)
 
-    exposure = sum(abs(p) for p in position) / len(position)
+    exposure = (len(position) - position.count(0)) / len(position)
 
     return {
         "total_return": total_return,
@@ -186,21 +221,21 @@ def trade_stats(position: List[int], strat_rets: List[float]) -> Tuple[int, floa
     current_pnl = 0.0
     in_trade = False
 
-    for i in range(1, len(position)):
-        if position[i] != 0 and position[i - 1] == 0:
+    for prev_pos, pos, ret in zip(position, position[1:], strat_rets[1:]):
+        if pos != 0 and prev_pos == 0:
             trades += 1
             in_trade = True
-            current_pnl = strat_rets[i]
-        elif position[i] != 0 and position[i] != position[i - 1]:
+            current_pnl = ret
+        elif pos != 0 and pos != prev_pos:
             if in_trade and current_pnl > 0:
                 wins += 1
             trades += 1
             in_trade = True
-            current_pnl = strat_rets[i]
-        elif position[i] != 0 and in_trade:
-            current_pnl += strat_rets[i]
-        elif position[i] == 0 and position[i - 1] != 0 and in_trade:
-            current_pnl += strat_rets[i]
+            current_pnl = ret
+        elif pos != 0 and in_trade:
+            current_pnl += ret
+        elif pos == 0 and prev_pos != 0 and in_trade:
+            current_pnl += ret
             if current_pnl > 0:
                 wins += 1
             in_trade = False
@@ -214,12 +249,12 @@ def trade_stats(position: List[int], strat_rets: List[float]) -> Tuple[int, floa
     return trades, win_rate
 
 
-def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[str, float]) -> List[StrategyResult]:
+def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[int, float]) -> List[StrategyResult]:
     close = data["close"]
     high = data["high"]
     low = data["low"]
     volume = data["volume"]
-    time = data["time"]
+    hour = data["hour"]
     taker_buy = data["taker_buy_base"]
 
     results: List[StrategyResult] = []
@@ -262,10 +297,12 @@ def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[str, float]) ->
 
     # Strategy 3: 20h breakout + volume confirmation
     vol_ma = rolling_mean(volume, 20)
+    high_max = rolling_max(high, 20)
+    low_min = rolling_min(low, 20)
     signal = [0] * len(close)
     for i in range(20, len(close)):
-        lookback_high = max(high[i - 20 : i])
-        lookback_low = min(low[i - 20 : i])
+        lookback_high = high_max[i - 1]
+        lookback_low = low_min[i - 1]
         if vol_ma[i] is None:
             continue
         if close[i] > lookback_high and volume[i] > 1.5 * vol_ma[i]:
@@ -281,7 +318,7 @@ def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[str, float]) ->
     )
 
     # Strategy 4: Hyperliquid BTC flow z-score signal
-    flow_series = [hyper_flow.get(t, 0.0) for t in time]
+    flow_series = [hyper_flow.get(h, 0.0) for h in hour]
     flow_mu = rolling_mean(flow_series, 24)
     flow_std = rolling_std(flow_series, 24)
     signal = [0] * len(close)
@@ -302,10 +339,7 @@ def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[str, float]) ->
     )
 
     # Strategy 5: Order flow imbalance on Binance taker flow
-    flow_ratio = [0.0] * len(close)
-    for i in range(len(close)):
-        if volume[i] > 0:
-            flow_ratio[i] = (2.0 * taker_buy[i] / volume[i]) - 1.0
+    flow_ratio = [(2.0 * buy / vol) - 1.0 if vol > 0 else 0.0 for buy, vol in zip(taker_buy, volume)]
 
     ratio_ma = rolling_mean(flow_ratio, 12)
     signal = [0] * len(close)
@@ -328,7 +362,7 @@ def build_signals(data: Dict[str, List[float]], hyper_flow: Dict[str, float]) ->
 
 
 def format_pct(x: float) -> str:
-    return f"{x * 100:.2f}%"
+    return f"{x:.2%}"
 
 
 def write_report(data: Dict[str, List[float]], results: List[StrategyResult], output: Path) -> None:
@@ -2,19 +2,29 @@
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import csv
 from datetime import datetime, timezone
+from http.client import HTTPException, HTTPSConnection
 import json
+import os
 from pathlib import Path
+import threading
 import time
-from typing import Any
+from typing import Any, Iterable, Iterator
 from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
-BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+BINANCE_HOST = "api.binance.com"
+BINANCE_KLINES_PATH = "/api/v3/klines"
 MAX_LIMIT = 1000
 ONE_HOUR_MS = 60 * 60 * 1000
 USER_AGENT = "news-agent/binance-btc-1h-exporter"
+CSV_WRITE_BUFFER_BYTES = 1 << 20
+
+_thread_state = threading.local()
+_connections_lock = threading.Lock()
+_open_connections: list[HTTPSConnection] = []
 
 
 def parse_time_to_ms(value: str | None, default_ms: int) -> int:
@@ -51,6 +61,25 @@ def ms_to_iso(ms: int) -> str:
     return dt.isoformat()
 
 
+def _binance_connection() -> HTTPSConnection:
+    # One keep-alive connection per worker thread, reused across pages.
+    connection = getattr(_thread_state, "connection", None)
+    if connection is None:
+        connection = HTTPSConnection(BINANCE_HOST, timeout=20)
+        _thread_state.connection = connection
+        with _connections_lock:
+            _open_connections.append(connection)
+    return connection
+
+
+def _close_connections() -> None:
+    with _connections_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+    for connection in connections:
+        connection.close()
+
+
 def fetch_klines(symbol: str, start_ms: int, end_ms: int, limit: int) -> list[list[Any]]:
     params = {
         "symbol": symbol,
@@ -59,45 +88,96 @@ def fetch_klines(symbol: str, start_ms: int, end_ms: int, limit: int) -> list[li
         "endTime": end_ms,
         "limit": min(max(limit, 1), MAX_LIMIT),
     }
-    url = f"{BINANCE_KLINES_URL}?{urlencode(params)}"
-    request = Request(url, headers={"User-Agent": USER_AGENT})
-    with urlopen(request, timeout=20) as response:
-        payload = response.read().decode("utf-8")
+    path = f"{BINANCE_KLINES_PATH}?{urlencode(params)}"
+    if getproxies().get("https") and not proxy_bypass(BINANCE_HOST):
+        # A direct HTTPSConnection would bypass HTTPS_PROXY; let urlopen route through the proxy.
+        request = Request(f"https://{BINANCE_HOST}{path}", headers={"User-Agent": USER_AGENT})
+        with urlopen(request, timeout=20) as response:
+            payload = response.read()
+    else:
+        payload = _pooled_get(path)
     data = json.loads(payload)
     if not isinstance(data, list):
         raise RuntimeError(f"Unexpected Binance response: {data!r}")
     return data
 
 
-def collect_1h_history(symbol: str, start_ms: int, end_ms: int, request_limit: int, sleep_seconds: float) -> list[list[Any]]:
-    rows: list[list[Any]] = []
-    cursor = start_ms
-
-    while cursor < end_ms:
-        batch = fetch_klines(symbol=symbol, start_ms=cursor, end_ms=end_ms, limit=request_limit)
-        if not batch:
+def _pooled_get(path: str) -> bytes:
+    for attempt in range(2):
+        connection = _binance_connection()
+        try:
+            connection.request("GET", path, headers={"User-Agent": USER_AGENT})
+            response = connection.getresponse()
+            payload = response.read()
             break
+        except (OSError, HTTPException):
+            # The server may drop an idle keep-alive connection; retry once on a fresh one.
+            connection.close()
+            _thread_state.connection = None
+            with _connections_lock:
+                _open_connections.remove(connection)
+            if attempt:
+                raise
+    if response.status >= 400:
+        body = payload.decode("utf-8", errors="replace")
+        raise OSError(f"Binance klines request failed with HTTP {response.status}: {body}")
+    return payload
 
-        rows.extend(batch)
-        last_open_ms = int(batch[-1][0])
-        next_cursor = last_open_ms + ONE_HOUR_MS
-        if next_cursor <= cursor:
-            break
-        cursor = next_cursor
 
+def iter_1h_history(
+    symbol: str,
+    start_ms: int,
+    end_ms: int,
+    request_limit: int,
+    sleep_seconds: float,
+    workers: int = 1,
+) -> Iterator[list[Any]]:
+    # Hourly candles open on fixed boundaries, so every page window is known
+    # up front and pages can be fetched independently of each other.
+    page_limit = min(max(request_limit, 1), MAX_LIMIT)
+    page_span_ms = page_limit * ONE_HOUR_MS
+    windows = [(cursor, min(cursor + page_span_ms - 1, end_ms)) for cursor in range(start_ms, end_ms, page_span_ms)]
+
+    def fetch_window(window: tuple[int, int]) -> list[list[Any]]:
+        batch = fetch_klines(symbol=symbol, start_ms=window[0], end_ms=window[1], limit=page_limit)
         if sleep_seconds > 0:
             time.sleep(sleep_seconds)
+        return batch
 
-    deduped: dict[int, list[Any]] = {}
-    for row in rows:
-        open_ms = int(row[0])
-        deduped[open_ms] = row
-    return [deduped[key] for key in sorted(deduped)]
+    # Pages arrive in window order and Binance sorts candles within a page, so
+    # a single open-time watermark drops any boundary duplicates.
+    last_open_ms = -1
+    executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+    try:
+        for batch in executor.map(fetch_window, windows):
+            for row in batch:
+                open_ms = int(row[0])
+                if open_ms > last_open_ms:
+                    last_open_ms = open_ms
+                    yield row
+    finally:
+        # map queues every window up front; on an error or early close, drop the
+        # pages not yet started instead of requesting them before reporting.
+        executor.shutdown(cancel_futures=True)
+        _close_connections()
 
 
-def write_csv(rows: list[list[Any]], output_path: Path) -> None:
+def write_csv(rows: Iterable[list[Any]], output_path: Path) -> int:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8", newline="") as handle:
+    # Rows stream in while pages are fetched; write beside the output and swap it in
+    # only once every page arrived, so a failed export leaves the previous CSV intact.
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        written = _write_rows(rows, temp_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    os.replace(temp_path, output_path)
+    return written
+
+
+def _write_rows(rows: Iterable[list[Any]], output_path: Path) -> int:
+    with output_path.open("w", encoding="utf-8", newline="", buffering=CSV_WRITE_BUFFER_BYTES) as handle:
         writer = csv.writer(handle)
         writer.writerow(
             [
@@ -116,26 +196,36 @@ def write_csv(rows: list[list[Any]], output_path: Path) -> None:
                 "taker_buy_quote_volume",
             ]
         )
-        for row in rows:
-            open_ms = int(row[0])
-            close_ms = int(row[6])
-            writer.writerow(
-                [
-                    ms_to_iso(open_ms),
-                    open_ms,
-                    row[1],
-                    row[2],
-                    row[3],
-                    row[4],
-                    row[5],
-                    ms_to_iso(close_ms),
-                    close_ms,
-                    row[7],
-                    row[8],
-                    row[9],
-                    row[10],
-                ]
-            )
+        written = 0
+
+        def csv_rows() -> Iterator[list[Any]]:
+            nonlocal written
+            for row in rows:
+                written += 1
+                yield _csv_row(row)
+
+        writer.writerows(csv_rows())
+    return written
+
+
+def _csv_row(row: list[Any]) -> list[Any]:
+    open_ms = int(row[0])
+    close_ms = int(row[6])
+    return [
+        ms_to_iso(open_ms),
+        open_ms,
+        row[1],
+        row[2],
+        row[3],
+        row[4],
+        row[5],
+        ms_to_iso(close_ms),
+        close_ms,
+        row[7],
+        row[8],
+        row[9],
+        row[10],
+    ]
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -159,11 +249,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=MAX_LIMIT,
         help=f"Per-request kline limit (1-{MAX_LIMIT}, default: {MAX_LIMIT}).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of kline pages fetched concurrently (default: 4).",
+    )
     parser.add_argument(
         "--sleep-seconds",
         type=float,
         default=0.15,
-        help="Delay between paginated requests to avoid hitting rate limits.",
+        help="Delay after each paginated request, per worker, to avoid hitting rate limits.",
     )
     parser.add_argument(
         "--output",
@@ -184,20 +280,21 @@ def main() -> None:
     if end_ms <= start_ms:
         raise RuntimeError("--end must be greater than --start.")
 
-    rows = collect_1h_history(
+    rows = iter_1h_history(
         symbol=args.symbol.upper(),
         start_ms=start_ms,
         end_ms=end_ms,
         request_limit=args.limit,
         sleep_seconds=max(args.sleep_seconds, 0.0),
+        workers=max(args.workers, 1),
     )
     output_path = Path(args.output)
-    write_csv(rows, output_path)
+    candles = write_csv(rows, output_path)
 
     print(f"symbol={args.symbol.upper()}")
     print(f"start={ms_to_iso(start_ms)}")
     print(f"end={ms_to_iso(end_ms)}")
-    print(f"candles={len(rows)}")
+    print(f"candles={candles}")
     print(f"output={output_path}")
 
 
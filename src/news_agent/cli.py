@@ -5,83 +5,66 @@ import json
 import os
 
 from .engine import IntelligenceEngine
+from .env import load_dotenv
 from .models import UserProfile, utcnow
 
 
-def _load_dotenv(path: str = ".env") -> None:
-    if not os.path.exists(path):
-        return
-
-    with open(path, encoding="utf-8") as handle:
-        for line in handle:
-            entry = line.strip()
-            if not entry or entry.startswith("#") or "=" not in entry:
-                continue
-
-            key, raw_value = entry.split("=", maxsplit=1)
-            key = key.strip()
-            value = raw_value.strip()
-            if not key:
-                continue
-
-            if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
-                value = value[1:-1]
-
-            os.environ.setdefault(key, value)
+# Demo payloads are only read by the ingestors, so they are built once.
+_SAMPLE_STREAMS: dict[str, list[dict]] = {
+    "onchain": [
+        {
+            "timestamp": "2026-02-01T12:00:00Z",
+            "summary": "Whale moved 120M USDT to exchange, BTC mention rising",
+            "magnitude_score": 0.95,
+            "source_credibility": 0.9,
+            "engagement_score": 0.7,
+            "velocity_change": 0.8,
+            "source_links": ["https://example.com/onchain/1"],
+        }
+    ],
+    "news": [
+        {
+            "timestamp": "2026-02-01T12:02:00Z",
+            "title": "ETF optimism sends BTC sentiment higher",
+            "sentiment_score": 0.6,
+            "magnitude_score": 0.65,
+            "source_credibility": 0.8,
+            "engagement_score": 0.6,
+            "source_links": ["https://example.com/news/1"],
+        }
+    ],
+    "social": [
+        {
+            "timestamp": "2026-02-01T12:03:00Z",
+            "text": "SOL volume spikes 180% in 30m",
+            "sentiment_score": 0.5,
+            "magnitude_score": 0.8,
+            "source_credibility": 0.55,
+            "engagement_score": 0.9,
+            "velocity_change": 0.9,
+            "source_links": ["https://example.com/social/1"],
+        }
+    ],
+    "hyperliquid": [
+        {
+            "timestamp": "2026-02-01T12:04:00Z",
+            "summary": "Hyperliquid 0xABCD...1234 BTC long 2.5000 @ 43100.00, uPnL +14250.00",
+            "entities": ["0xABCDEF1234", "BTC", "HYPERLIQUID"],
+            "sentiment_score": 0.2,
+            "magnitude_score": 0.95,
+            "source_credibility": 0.9,
+            "engagement_score": 0.74,
+            "velocity_change": 0.82,
+            "source_links": ["https://app.hyperliquid.xyz/trader/0xABCDEF1234"],
+            "event_type": "position_snapshot",
+            "unrealized_pnl": 14250.0,
+        }
+    ],
+}
 
 
 def _sample_streams() -> dict[str, list[dict]]:
-    return {
-        "onchain": [
-            {
-                "timestamp": "2026-02-01T12:00:00Z",
-                "summary": "Whale moved 120M USDT to exchange, BTC mention rising",
-                "magnitude_score": 0.95,
-                "source_credibility": 0.9,
-                "engagement_score": 0.7,
-                "velocity_change": 0.8,
-                "source_links": ["https://example.com/onchain/1"],
-            }
-        ],
-        "news": [
-            {
-                "timestamp": "2026-02-01T12:02:00Z",
-                "title": "ETF optimism sends BTC sentiment higher",
-                "sentiment_score": 0.6,
-                "magnitude_score": 0.65,
-                "source_credibility": 0.8,
-                "engagement_score": 0.6,
-                "source_links": ["https://example.com/news/1"],
-            }
-        ],
-        "social": [
-            {
-                "timestamp": "2026-02-01T12:03:00Z",
-                "text": "SOL volume spikes 180% in 30m",
-                "sentiment_score": 0.5,
-                "magnitude_score": 0.8,
-                "source_credibility": 0.55,
-                "engagement_score": 0.9,
-                "velocity_change": 0.9,
-                "source_links": ["https://example.com/social/1"],
-            }
-        ],
-        "hyperliquid": [
-            {
-                "timestamp": "2026-02-01T12:04:00Z",
-                "summary": "Hyperliquid 0xABCD...1234 BTC long 2.5000 @ 43100.00, uPnL +14250.00",
-                "entities": ["0xABCDEF1234", "BTC", "HYPERLIQUID"],
-                "sentiment_score": 0.2,
-                "magnitude_score": 0.95,
-                "source_credibility": 0.9,
-                "engagement_score": 0.74,
-                "velocity_change": 0.82,
-                "source_links": ["https://app.hyperliquid.xyz/trader/0xABCDEF1234"],
-                "event_type": "position_snapshot",
-                "unrealized_pnl": 14250.0,
-            }
-        ],
-    }
+    return {source: list(payloads) for source, payloads in _SAMPLE_STREAMS.items()}
 
 
 def _split_csv(raw: str | None, uppercase: bool = False) -> set[str]:
@@ -118,7 +101,7 @@ def _fetch_limit(default_value: int = 25) -> int:
 
 
 def main() -> None:
-    _load_dotenv()
+    load_dotenv()
 
     parser = argparse.ArgumentParser(description="Crypto-first intelligence agent")
     parser.add_argument(
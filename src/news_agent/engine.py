@@ -1,6 +1,11 @@
 from __future__ import annotations
 
 from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import heapq
+from operator import attrgetter
 
 from .alerting import Alert, build_alert, should_alert
 from .ingestion import HyperliquidIngestor, NewsIngestor, OnChainIngestor, SocialIngestor
@@ -8,6 +13,9 @@ from .models import Event, Signal, UserProfile
 from .personalization import PersonalizationModel
 from .scoring import build_signal
 
+_event_timestamp = attrgetter("timestamp")
+_signal_score = attrgetter("actionability_score")
+
 
 class IntelligenceEngine:
     def __init__(self, user_profile: UserProfile) -> None:
@@ -21,22 +29,27 @@ class IntelligenceEngine:
         }
 
     def ingest_all(self, streams: dict[str, list[dict]]) -> list[Event]:
-        events: list[Event] = []
+        # Live ingestors already emit newest-first, so each per-source sort is a
+        # linear Timsort pass and the sources only need a k-way merge.
+        per_source: list[list[Event]] = []
         for source_type, payloads in streams.items():
             ingestor = self.ingestors[source_type]
-            events.extend(ingestor.ingest(payloads))
-        return self._deduplicate(events)
+            per_source.append(sorted(ingestor.ingest(payloads), key=_event_timestamp, reverse=True))
+        return self._deduplicate(heapq.merge(*per_source, key=_event_timestamp, reverse=True))
 
     def collect_live_streams(self, limit_per_source: int = 25) -> dict[str, list[dict]]:
-        streams: dict[str, list[dict]] = {}
-        for source_type, ingestor in self.ingestors.items():
-            streams[source_type] = ingestor.fetch_latest(self.user_profile, limit_per_source)
-        return streams
+        # Each ingestor talks to a different host, so fetch them concurrently.
+        with ThreadPoolExecutor(max_workers=len(self.ingestors)) as executor:
+            payloads = executor.map(
+                lambda ingestor: ingestor.fetch_latest(self.user_profile, limit_per_source),
+                self.ingestors.values(),
+            )
+            return dict(zip(self.ingestors, payloads))
 
-    def _deduplicate(self, events: list[Event]) -> list[Event]:
+    def _deduplicate(self, events: Iterable[Event]) -> list[Event]:
         seen: set[str] = set()
         deduped: list[Event] = []
-        for event in sorted(events, key=lambda e: e.timestamp, reverse=True):
+        for event in events:
             if event.duplicate_key in seen:
                 continue
             seen.add(event.duplicate_key)
@@ -45,12 +58,14 @@ class IntelligenceEngine:
 
     def score_events(self, events: list[Event]) -> list[Signal]:
         source_counts = Counter(e.source_type for e in events)
+        weights = {source: self.personalization.weight_for(source) for source in source_counts}
+        penalties = {source: 0.2 if count > 8 else 0.0 for source, count in source_counts.items()}
+        now = datetime.now(timezone.utc)
         signals: list[Signal] = []
         for event in events:
-            weight = self.personalization.weight_for(event.source_type)
-            duplicate_penalty = 0.2 if source_counts[event.source_type] > 8 else 0.0
-            signals.append(build_signal(event, self.user_profile, weight, duplicate_penalty))
-        return sorted(signals, key=lambda s: s.actionability_score, reverse=True)
+            source = event.source_type
+            signals.append(build_signal(event, self.user_profile, weights[source], penalties[source], now))
+        return sorted(signals, key=_signal_score, reverse=True)
 
     def generate_alerts(self, signals: list[Signal]) -> list[Alert]:
         return [build_alert(s) for s in signals if should_alert(s, self.user_profile)]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import os
+import re
+
+# One `KEY=value` assignment per line; comment lines and lines without `=` never match.
+DOTENV_ENTRY_PATTERN = re.compile(r"^[^\S\n]*([^#=\s][^=\n]*?)[^\S\n]*=([^\n]*)$", re.MULTILINE)
+
+
+def load_dotenv(path: str = ".env") -> None:
+    if not os.path.exists(path):
+        return
+
+    with open(path, encoding="utf-8") as handle:
+        text = handle.read()
+
+    for key, raw_value in DOTENV_ENTRY_PATTERN.findall(text):
+        value = raw_value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
+            value = value[1:-1]
+        os.environ.setdefault(key, value)
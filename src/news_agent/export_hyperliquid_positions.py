@@ -1,47 +1,28 @@
 from __future__ import annotations
 
 import argparse
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 import csv
+from datetime import datetime
+import heapq
+from operator import attrgetter
 import os
 import re
 import socket
 
+from .env import load_dotenv
 from .hyperliquid import HyperliquidInfoClient, PositionHistoryRow, reconstruct_position_history
 
-WALLET_PATTERN = re.compile(r"0x[a-fA-F0-9]{40}")
-
-
-def load_dotenv(path: str = ".env") -> None:
-    if not os.path.exists(path):
-        return
-
-    with open(path, encoding="utf-8") as handle:
-        for line in handle:
-            entry = line.strip()
-            if not entry or entry.startswith("#") or "=" not in entry:
-                continue
-
-            key, raw_value = entry.split("=", maxsplit=1)
-            key = key.strip()
-            value = raw_value.strip()
-            if not key:
-                continue
-            if len(value) >= 2 and value[0] == value[-1] and value[0] in {"'", '"'}:
-                value = value[1:-1]
-            os.environ.setdefault(key, value)
+WALLET_PATTERN = re.compile(r"0x[a-f0-9]{40}")
+CSV_WRITE_BUFFER_BYTES = 1 << 20
+_row_timestamp = attrgetter("timestamp")
 
 
 def wallets_from_env(raw_wallets: str) -> list[str]:
-    matches = WALLET_PATTERN.findall(raw_wallets)
-    seen: set[str] = set()
-    wallets: list[str] = []
-    for wallet in matches:
-        lowered = wallet.lower()
-        if lowered in seen:
-            continue
-        seen.add(lowered)
-        wallets.append(wallet)
-    return wallets
+    # Hyperliquid addresses are case-insensitive; lowering the input once lets
+    # the pattern skip case folding and the matches dedupe as-is.
+    return list(dict.fromkeys(WALLET_PATTERN.findall(raw_wallets.lower())))
 
 
 def check_hyperliquid_dns(host: str = "api.hyperliquid.xyz") -> bool:
@@ -52,7 +33,7 @@ def check_hyperliquid_dns(host: str = "api.hyperliquid.xyz") -> bool:
     return True
 
 
-def write_history_csv(path: str, rows: list[PositionHistoryRow]) -> None:
+def write_history_csv(path: str, rows: Iterable[PositionHistoryRow]) -> None:
     fieldnames = [
         "wallet",
         "timestamp",
@@ -70,28 +51,31 @@ def write_history_csv(path: str, rows: list[PositionHistoryRow]) -> None:
         "cumulative_fees",
     ]
 
-    with open(path, "w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow(
-                {
-                    "wallet": row.wallet,
-                    "timestamp": row.timestamp.isoformat(),
-                    "trade_id": row.trade_id,
-                    "symbol": row.symbol,
-                    "fill_side": row.fill_side,
-                    "fill_size": f"{row.fill_size:.10f}",
-                    "fill_price": f"{row.fill_price:.10f}",
-                    "fee": f"{row.fee:.10f}",
-                    "position_side": row.position_side,
-                    "position_size": f"{row.position_size:.10f}",
-                    "avg_entry_price": f"{row.avg_entry_price:.10f}",
-                    "realized_pnl": f"{row.realized_pnl:.10f}",
-                    "cumulative_realized_pnl": f"{row.cumulative_realized_pnl:.10f}",
-                    "cumulative_fees": f"{row.cumulative_fees:.10f}",
-                }
-            )
+    decimal = "{:.10f}".format
+    # Fills from one order share a timestamp, so each distinct instant is formatted once.
+    iso_timestamps: dict[datetime, str] = {}
+    with open(path, "w", encoding="utf-8", newline="", buffering=CSV_WRITE_BUFFER_BYTES) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(fieldnames)
+        writer.writerows(
+            [
+                row.wallet,
+                iso_timestamps.get(row.timestamp) or iso_timestamps.setdefault(row.timestamp, row.timestamp.isoformat()),
+                row.trade_id,
+                row.symbol,
+                row.fill_side,
+                decimal(row.fill_size),
+                decimal(row.fill_price),
+                decimal(row.fee),
+                row.position_side,
+                decimal(row.position_size),
+                decimal(row.avg_entry_price),
+                decimal(row.realized_pnl),
+                decimal(row.cumulative_realized_pnl),
+                decimal(row.cumulative_fees),
+            ]
+            for row in rows
+        )
 
 
 def main() -> None:
@@ -109,6 +93,12 @@ def main() -> None:
         default=max(50, int(os.getenv("NEWS_AGENT_HL_FILL_LIMIT", "1000"))),
         help="Max number of fills to fetch per wallet.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(1, int(os.getenv("NEWS_AGENT_HL_FETCH_WORKERS", "4"))),
+        help="Number of wallets fetched concurrently.",
+    )
     args = parser.parse_args()
 
     wallets = wallets_from_env(os.getenv("NEWS_AGENT_HYPERLIQUID_WALLETS", ""))
@@ -116,18 +106,22 @@ def main() -> None:
         raise RuntimeError("NEWS_AGENT_HYPERLIQUID_WALLETS is empty or contains no valid wallet addresses.")
 
     client = HyperliquidInfoClient(info_url=os.getenv("HYPERLIQUID_INFO_URL", "https://api.hyperliquid.xyz/info"))
-    all_rows: list[PositionHistoryRow] = []
+    fill_limit = max(1, args.fill_limit)
 
-    for wallet in wallets:
-        fills = client.user_fills(wallet, limit=max(1, args.fill_limit))
-        rows = reconstruct_position_history(wallet, fills)
-        all_rows.extend(rows)
+    # Wallet fetches are independent HTTP round trips; map keeps wallet order
+    # so equal timestamps still come out in wallet order after the merge.
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            fills_by_wallet = executor.map(lambda wallet: client.user_fills(wallet, limit=fill_limit), wallets)
+            histories = [reconstruct_position_history(wallet, fills) for wallet, fills in zip(wallets, fills_by_wallet)]
+    finally:
+        client.close()
 
-    all_rows.sort(key=lambda row: row.timestamp)
-    write_history_csv(args.output, all_rows)
+    # Each history is already chronological, so a k-way merge replaces the global sort.
+    write_history_csv(args.output, heapq.merge(*histories, key=_row_timestamp))
 
     print(f"wallets={len(wallets)}")
-    print(f"rows={len(all_rows)}")
+    print(f"rows={sum(len(history) for history in histories)}")
     print(f"output={args.output}")
     if not check_hyperliquid_dns():
         print("warning=api.hyperliquid.xyz DNS resolution failed in current environment")
@@ -2,9 +2,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
 import json
+from operator import itemgetter
+import sys
+import threading
 from typing import Any, Callable
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 
 from .models import utcnow
 from .normalization import parse_timestamp
@@ -80,13 +85,17 @@ class HyperliquidInfoClient:
         timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
     ) -> None:
         self.info_url = info_url
-        self.http_post_json = http_post_json or _default_post_json
+        self.http_post_json = http_post_json or self._post_json
         self.timeout_seconds = timeout_seconds
+        self._connections = _ConnectionPool()
 
     def user_fills(self, wallet: str, limit: int = 200) -> list[dict[str, Any]]:
         response = self._query({"type": "userFills", "user": wallet})
         fills = [item for item in _as_list(response) if isinstance(item, dict)]
-        fills.sort(key=_fill_sort_key, reverse=True)
+        # _normalize_fill needs the same timestamp again, so keep the parsed value on the fill.
+        for fill in fills:
+            fill[_PARSED_TIME_KEY] = _fill_sort_key(fill)
+        fills.sort(key=_parsed_fill_time, reverse=True)
         return fills[: max(limit, 0)]
 
     def open_orders(self, wallet: str) -> list[dict[str, Any]]:
@@ -103,10 +112,48 @@ class HyperliquidInfoClient:
             return response
         return {}
 
+    def close(self) -> None:
+        self._connections.close()
+
+    def _post_json(self, url: str, payload: dict[str, Any], timeout_seconds: float) -> Any:
+        parts = urlsplit(url)
+        path = f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+        body = json.dumps(payload).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": DEFAULT_USER_AGENT,
+        }
+        if getproxies().get(parts.scheme) and not proxy_bypass(parts.hostname or ""):
+            # Pooled connections dial the host directly; let urlopen route through the configured proxy.
+            request = Request(url, data=body, method="POST", headers=headers)
+            with urlopen(request, timeout=timeout_seconds) as response:
+                response_bytes = response.read()
+                encoding = response.headers.get_content_charset() or "utf-8"
+            return json.loads(response_bytes.decode(encoding, errors="replace"))
+        connection = self._connections.acquire(parts.scheme, parts.netloc, timeout_seconds)
+        for attempt in range(2):
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                response_bytes = response.read()
+                break
+            except (OSError, HTTPException):
+                # The server may drop an idle keep-alive connection; retry once on a fresh one.
+                connection.close()
+                if attempt:
+                    raise
+                connection = self._connections.connect(parts.scheme, parts.netloc, timeout_seconds)
+        self._connections.release(parts.scheme, parts.netloc, connection)
+        if response.status >= 400:
+            raise OSError(f"Hyperliquid info request failed with HTTP {response.status}")
+        encoding = response.headers.get_content_charset() or "utf-8"
+        return json.loads(response_bytes.decode(encoding, errors="replace"))
+
     def _query(self, payload: dict[str, Any]) -> Any:
         try:
             return self.http_post_json(self.info_url, payload, self.timeout_seconds)
-        except (OSError, ValueError):
+        except (OSError, ValueError, HTTPException):
             return []
 
 
@@ -122,7 +169,7 @@ def normalize_positions(wallet: str, state: dict[str, Any]) -> list[HyperliquidP
         if not isinstance(position, dict):
             continue
 
-        symbol = str(position.get("coin") or position.get("symbol") or position.get("asset") or "").upper()
+        symbol = sys.intern(str(position.get("coin") or position.get("symbol") or position.get("asset") or "").upper())
         if not symbol:
             continue
 
@@ -161,33 +208,35 @@ def normalize_positions(wallet: str, state: dict[str, Any]) -> list[HyperliquidP
 
 
 def aggregate_trade_history(wallet: str, fills: list[dict[str, Any]]) -> tuple[list[HyperliquidTrade], WalletPerformance]:
-    normalized = [_normalize_fill(wallet, fill) for fill in fills]
-    normalized = [fill for fill in normalized if fill is not None]
-    normalized.sort(key=lambda fill: fill.timestamp)
+    normalized = _normalized_fills(wallet, fills)
 
     states: dict[str, _PositionState] = {}
     trades: list[HyperliquidTrade] = []
     cumulative_pnl = 0.0
+    total_fees = 0.0
     realized_hits = 0
 
-    for fill in normalized:
-        state = states.setdefault(fill.symbol, _PositionState())
-        realized, entry_price, exit_price = state.apply_fill(fill.side, fill.size, fill.price)
-        realized -= fill.fee
+    for trade_id, symbol, side, size, price, fee, timestamp in normalized:
+        state = states.get(symbol)
+        if state is None:
+            state = states[symbol] = _PositionState()
+        realized, entry_price, exit_price = state.apply_fill(side, size, price)
+        realized -= fee
         cumulative_pnl += realized
+        total_fees += fee
         if realized > 0:
             realized_hits += 1
 
         trades.append(
             HyperliquidTrade(
                 wallet=wallet,
-                trade_id=fill.trade_id,
-                symbol=fill.symbol,
-                side=fill.side,
-                size=fill.size,
-                price=fill.price,
-                fee=fill.fee,
-                timestamp=fill.timestamp,
+                trade_id=trade_id,
+                symbol=symbol,
+                side=side,
+                size=size,
+                price=price,
+                fee=fee,
+                timestamp=timestamp,
                 entry_price=entry_price,
                 exit_price=exit_price,
                 realized_pnl=realized,
@@ -197,13 +246,11 @@ def aggregate_trade_history(wallet: str, fills: list[dict[str, Any]]) -> tuple[l
 
     trade_count = len(trades)
     latest_trade_time = trades[-1].timestamp if trades else utcnow()
-    total_realized = sum(trade.realized_pnl for trade in trades)
-    total_fees = sum(trade.fee for trade in trades)
     win_rate = (realized_hits / trade_count) if trade_count else 0.0
     performance = WalletPerformance(
         wallet=wallet,
         trade_count=trade_count,
-        total_realized_pnl=total_realized,
+        total_realized_pnl=cumulative_pnl,
         cumulative_fees=total_fees,
         win_rate=win_rate,
         latest_trade_time=latest_trade_time,
@@ -212,22 +259,22 @@ def aggregate_trade_history(wallet: str, fills: list[dict[str, Any]]) -> tuple[l
 
 
 def reconstruct_position_history(wallet: str, fills: list[dict[str, Any]]) -> list[PositionHistoryRow]:
-    normalized = [_normalize_fill(wallet, fill) for fill in fills]
-    normalized = [fill for fill in normalized if fill is not None]
-    normalized.sort(key=lambda fill: fill.timestamp)
+    normalized = _normalized_fills(wallet, fills)
 
     states: dict[str, _PositionState] = {}
     rows: list[PositionHistoryRow] = []
     cumulative_realized_pnl = 0.0
     cumulative_fees = 0.0
 
-    for fill in normalized:
-        state = states.setdefault(fill.symbol, _PositionState())
-        realized, _, _ = state.apply_fill(fill.side, fill.size, fill.price)
-        realized_after_fee = realized - fill.fee
+    for trade_id, symbol, side, size, price, fee, timestamp in normalized:
+        state = states.get(symbol)
+        if state is None:
+            state = states[symbol] = _PositionState()
+        realized, _, _ = state.apply_fill(side, size, price)
+        realized_after_fee = realized - fee
 
         cumulative_realized_pnl += realized_after_fee
-        cumulative_fees += fill.fee
+        cumulative_fees += fee
         signed_size = state.signed_size
 
         if signed_size > 0:
@@ -240,13 +287,13 @@ def reconstruct_position_history(wallet: str, fills: list[dict[str, Any]]) -> li
         rows.append(
             PositionHistoryRow(
                 wallet=wallet,
-                timestamp=fill.timestamp,
-                trade_id=fill.trade_id,
-                symbol=fill.symbol,
-                fill_side=fill.side,
-                fill_size=fill.size,
-                fill_price=fill.price,
-                fee=fill.fee,
+                timestamp=timestamp,
+                trade_id=trade_id,
+                symbol=symbol,
+                fill_side=side,
+                fill_size=size,
+                fill_price=price,
+                fee=fee,
                 position_side=position_side,
                 position_size=abs(signed_size),
                 avg_entry_price=state.average_entry,
@@ -259,22 +306,41 @@ def reconstruct_position_history(wallet: str, fills: list[dict[str, Any]]) -> li
     return rows
 
 
-def _default_post_json(url: str, payload: dict[str, Any], timeout_seconds: float) -> Any:
-    body = json.dumps(payload).encode("utf-8")
-    request = Request(
-        url,
-        data=body,
-        method="POST",
-        headers={
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "User-Agent": DEFAULT_USER_AGENT,
-        },
-    )
-    with urlopen(request, timeout=timeout_seconds) as response:
-        response_bytes = response.read()
-        encoding = response.headers.get_content_charset() or "utf-8"
-    return json.loads(response_bytes.decode(encoding, errors="replace"))
+class _ConnectionPool:
+    """Idle keep-alive connections per (scheme, host), shared by every thread using one client."""
+
+    def __init__(self) -> None:
+        self._idle: dict[tuple[str, str], list[HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, scheme: str, netloc: str, timeout_seconds: float) -> HTTPConnection:
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+        return self.connect(scheme, netloc, timeout_seconds)
+
+    def connect(self, scheme: str, netloc: str, timeout_seconds: float) -> HTTPConnection:
+        connection_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        return connection_class(netloc, timeout=timeout_seconds)
+
+    def release(self, scheme: str, netloc: str, connection: HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [connection for connections in self._idle.values() for connection in connections]
+            self._idle.clear()
+        for connection in idle:
+            connection.close()
+
+
+def _normalized_fills(wallet: str, fills: list[dict[str, Any]]) -> list[_NormalizedFill]:
+    normalized = [_normalize_fill(wallet, fill) for fill in fills]
+    normalized = [fill for fill in normalized if fill is not None]
+    normalized.sort(key=_fill_timestamp)
+    return normalized
 
 
 def _as_list(value: Any) -> list[Any]:
@@ -289,6 +355,12 @@ def _as_list(value: Any) -> list[Any]:
 
 
 def _fill_sort_key(fill: dict[str, Any]) -> datetime:
+    value = fill.get("time")
+    if isinstance(value, (int, float)):
+        try:
+            return _epoch_datetime(value)
+        except (TypeError, ValueError):
+            pass
     for key in ("time", "timestamp", "ts"):
         value = fill.get(key)
         if value is None:
@@ -301,6 +373,12 @@ def _fill_sort_key(fill: dict[str, Any]) -> datetime:
 
 
 def _state_timestamp(state: dict[str, Any]) -> datetime:
+    value = state.get("time")
+    if isinstance(value, (int, float)):
+        try:
+            return _epoch_datetime(value)
+        except (TypeError, ValueError):
+            pass
     for key in ("time", "timestamp", "lastUpdated", "updatedAt"):
         value = state.get(key)
         if value is None:
@@ -312,30 +390,41 @@ def _state_timestamp(state: dict[str, Any]) -> datetime:
     return utcnow()
 
 
+def _epoch_datetime(value: float) -> datetime:
+    # Hyperliquid reports times as epoch milliseconds; skip the generic string handling in parse_timestamp.
+    numeric = float(value)
+    if numeric > 10_000_000_000:
+        numeric = numeric / 1000
+    return datetime.fromtimestamp(numeric, tz=timezone.utc)
+
+
 def _safe_float(*values: Any, default: float = 0.0) -> float:
     for value in values:
         if value is None:
             continue
+        kind = type(value)
+        if kind is float:
+            return value
         try:
-            return float(str(value))
+            return float(value if kind is str else str(value))
         except (TypeError, ValueError):
             continue
     return default
 
 
-@dataclass(slots=True)
-class _NormalizedFill:
-    trade_id: str
-    symbol: str
-    side: str
-    size: float
-    price: float
-    fee: float
-    timestamp: datetime
+# (trade_id, symbol, side, size, price, fee, timestamp); a plain tuple because one is built per fill
+# and the replay loops unpack it straight into locals.
+_NormalizedFill = tuple[str, str, str, float, float, float, datetime]
+_fill_timestamp = itemgetter(6)
+_PARSED_TIME_KEY = "_parsed_time"
+_parsed_fill_time = itemgetter(_PARSED_TIME_KEY)
+# Hyperliquid reports fill sides as "B" (bid) / "A" (ask); plain words cover other feeds.
+_FILL_SIDES = {"b": "buy", "a": "sell", "buy": "buy", "sell": "sell", "long": "buy", "short": "sell"}
 
 
 def _normalize_fill(wallet: str, fill: dict[str, Any]) -> _NormalizedFill | None:
-    symbol = str(fill.get("coin") or fill.get("symbol") or fill.get("asset") or "").upper()
+    # A wallet trades a handful of coins over many fills; interning keeps one string per coin.
+    symbol = sys.intern(str(fill.get("coin") or fill.get("symbol") or fill.get("asset") or "").upper())
     if not symbol:
         return None
 
@@ -343,16 +432,18 @@ def _normalize_fill(wallet: str, fill: dict[str, Any]) -> _NormalizedFill | None
     if not trade_id:
         trade_id = f"{wallet}:{symbol}:{fill.get('time') or fill.get('timestamp') or '0'}"
 
+    signed_size = _safe_float(fill.get("sz"), fill.get("size"), fill.get("sizeDelta"), default=0.0)
     side_raw = str(fill.get("side") or fill.get("dir") or "").lower()
-    if "sell" in side_raw or "short" in side_raw:
-        side = "sell"
-    elif "buy" in side_raw or "long" in side_raw:
-        side = "buy"
-    else:
-        size_guess = _safe_float(fill.get("sz"), fill.get("size"), fill.get("sizeDelta"), default=0.0)
-        side = "buy" if size_guess >= 0 else "sell"
-
-    size = abs(_safe_float(fill.get("sz"), fill.get("size"), fill.get("sizeDelta"), default=0.0))
+    side = _FILL_SIDES.get(side_raw)
+    if side is None:
+        if "sell" in side_raw or "short" in side_raw:
+            side = "sell"
+        elif "buy" in side_raw or "long" in side_raw:
+            side = "buy"
+        else:
+            side = "buy" if signed_size >= 0 else "sell"
+
+    size = abs(signed_size)
     if size == 0:
         return None
 
@@ -361,16 +452,10 @@ def _normalize_fill(wallet: str, fill: dict[str, Any]) -> _NormalizedFill | None
         return None
 
     fee = abs(_safe_float(fill.get("fee"), fill.get("feePaid"), default=0.0))
-    timestamp = _fill_sort_key(fill)
-    return _NormalizedFill(
-        trade_id=trade_id,
-        symbol=symbol,
-        side=side,
-        size=size,
-        price=price,
-        fee=fee,
-        timestamp=timestamp,
-    )
+    timestamp = fill.get(_PARSED_TIME_KEY)
+    if timestamp is None:
+        timestamp = _fill_sort_key(fill)
+    return trade_id, symbol, side, size, price, fee, timestamp
 
 
 @dataclass(slots=True)
@@ -381,36 +466,36 @@ class _PositionState:
     def apply_fill(self, side: str, size: float, price: float) -> tuple[float, float, float]:
         signed_change = size if side == "buy" else -size
         previous_size = self.signed_size
-        previous_entry = self.average_entry
-
-        realized = 0.0
-        entry_price = previous_entry if previous_entry > 0 else price
-        exit_price = 0.0
-
-        if previous_size == 0 or (previous_size > 0 and signed_change > 0) or (previous_size < 0 and signed_change < 0):
-            new_size = previous_size + signed_change
-            if previous_size == 0:
-                self.average_entry = price
-            elif abs(new_size) > 0:
-                weighted = (abs(previous_size) * previous_entry) + (abs(signed_change) * price)
-                self.average_entry = weighted / abs(new_size)
+        new_size = previous_size + signed_change
+        if previous_size == 0:
             self.signed_size = new_size
-            return realized, self.average_entry, exit_price
+            self.average_entry = price
+            return 0.0, price, 0.0
 
-        closing_size = min(abs(previous_size), abs(signed_change))
-        direction = 1.0 if previous_size > 0 else -1.0
-        realized = closing_size * (price - previous_entry) * direction
-        exit_price = price
+        previous_entry = self.average_entry
+        if previous_size > 0:
+            if signed_change > 0:
+                self.average_entry = (previous_size * previous_entry + signed_change * price) / new_size
+                self.signed_size = new_size
+                return 0.0, self.average_entry, 0.0
+            realized = min(previous_size, -signed_change) * (price - previous_entry)
+            flipped = new_size < 0
+        else:
+            if signed_change < 0:
+                self.average_entry = (previous_size * previous_entry + signed_change * price) / new_size
+                self.signed_size = new_size
+                return 0.0, self.average_entry, 0.0
+            realized = -min(-previous_size, signed_change) * (price - previous_entry)
+            flipped = new_size > 0
 
-        new_size = previous_size + signed_change
+        entry_price = previous_entry if previous_entry > 0 else price
         if new_size == 0:
             self.signed_size = 0.0
             self.average_entry = 0.0
-        elif (previous_size > 0 and new_size < 0) or (previous_size < 0 and new_size > 0):
+        elif flipped:
             self.signed_size = new_size
             self.average_entry = price
             entry_price = price
         else:
             self.signed_size = new_size
-            self.average_entry = previous_entry
-        return realized, entry_price, exit_price
+        return realized, entry_price, price
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from collections import Counter
 from collections.abc import Iterable
 from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+import heapq
 import json
+from operator import attrgetter
 import os
-from urllib.parse import quote_plus, urlencode
+from urllib.parse import quote_plus
 
 from .hyperliquid import HyperliquidInfoClient, HyperliquidPosition, HyperliquidTrade, WalletPerformance, aggregate_trade_history, normalize_positions
 from .live_sources import FeedEntry, fetch_text, parse_feed_entries
@@ -33,6 +35,8 @@ SOCIAL_SOURCE_CREDIBILITY = {
 }
 
 HYPERLIQUID_SOURCE_CREDIBILITY = 0.9
+HYPERLIQUID_MAX_CONCURRENT_REQUESTS = 16
+FEED_FETCH_MAX_WORKERS = 16
 
 IMPACT_KEYWORDS = {
     "etf": 0.18,
@@ -72,6 +76,8 @@ NEGATIVE_SENTIMENT_TERMS = {
 
 TextGetter = Callable[[str], str]
 
+_trade_timestamp = attrgetter("timestamp")
+
 
 class BaseIngestor:
     source_type: str
@@ -103,19 +109,12 @@ class OnChainIngestor(BaseIngestor):
 
         payloads: list[dict] = []
         per_wallet_limit = max(1, min(10, max(limit, 1)))
+        # Only the wallet and API key vary between requests, so encode them alone.
+        query_prefix = f"{ETHERSCAN_TX_URL}?module=account&action=txlist&address="
+        query_suffix = f"&sort=desc&offset={per_wallet_limit}&page=1&apikey={quote_plus(api_key)}"
+        # Etherscan rate-limits per API key, so wallets are queried one at a time.
         for wallet in wallets:
-            params = urlencode(
-                {
-                    "module": "account",
-                    "action": "txlist",
-                    "address": wallet,
-                    "sort": "desc",
-                    "offset": per_wallet_limit,
-                    "page": 1,
-                    "apikey": api_key,
-                }
-            )
-            url = f"{ETHERSCAN_TX_URL}?{params}"
+            url = f"{query_prefix}{quote_plus(wallet)}{query_suffix}"
             try:
                 raw = self.http_get(url)
                 response = json.loads(raw)
@@ -126,13 +125,14 @@ class OnChainIngestor(BaseIngestor):
             if not isinstance(result, list):
                 continue
 
+            wallet_lower = wallet.lower()
+            short_wallet = f"{wallet[:6]}...{wallet[-4:]}" if len(wallet) > 10 else wallet
             for tx in result:
-                payload = _tx_to_payload(wallet, tx)
+                payload = _tx_to_payload(wallet, wallet_lower, short_wallet, tx)
                 if payload:
                     payloads.append(payload)
 
-        payloads.sort(key=lambda p: _sort_timestamp(p.get("timestamp")), reverse=True)
-        return payloads[: max(limit, 0)]
+        return _newest_payloads(payloads, limit)
 
 
 class NewsIngestor(BaseIngestor):
@@ -144,26 +144,26 @@ class NewsIngestor(BaseIngestor):
 
     def fetch_latest(self, user_profile: UserProfile, limit: int = 25) -> list[dict]:
         entries: list[FeedEntry] = []
-        for feed_url in self._configured_feeds():
-            try:
-                xml_text = self.http_get(feed_url)
-            except OSError:
-                continue
-            entries.extend(parse_feed_entries(xml_text, feed_url))
+        feed_urls = self._configured_feeds()
+        for feed_url, xml_text in zip(feed_urls, _fetch_texts(self.http_get, feed_urls)):
+            if xml_text is not None:
+                entries.extend(parse_feed_entries(xml_text, feed_url))
 
         if not entries:
             return []
 
-        token_mentions = _token_mentions(entries, user_profile.token_watchlist)
+        # Build each entry's text once; both the mention tally and the payload pass read it.
+        texts = [f"{entry.title} {entry.summary}".strip() for entry in entries]
+        token_mentions = _token_mentions(texts, user_profile.token_watchlist)
         peak_mentions = max(token_mentions.values(), default=1)
         now_iso = utcnow().isoformat()
 
         payloads: list[dict] = []
-        for entry in entries:
-            text = f"{entry.title} {entry.summary}".strip()
+        for entry, text in zip(entries, texts):
+            lowered = text.lower()
             entities = extract_entities(text)
             watched_entities = [entity for entity in entities if entity in user_profile.token_watchlist]
-            mention_score = max((token_mentions[e] for e in watched_entities), default=0)
+            mention_score = max((token_mentions.get(e, 0) for e in watched_entities), default=0)
             spike_ratio = mention_score / peak_mentions if mention_score else 0.0
 
             payloads.append(
@@ -172,8 +172,8 @@ class NewsIngestor(BaseIngestor):
                     "title": entry.title,
                     "summary": entry.title,
                     "entities": entities,
-                    "sentiment_score": _sentiment_from_text(text),
-                    "magnitude_score": _magnitude_from_text(text, base=0.5),
+                    "sentiment_score": _sentiment_from_text(lowered),
+                    "magnitude_score": _magnitude_from_text(lowered, base=0.5),
                     "source_credibility": _news_source_credibility(entry.source),
                     "engagement_score": _clamp(0.45 + (spike_ratio * 0.45)),
                     "velocity_change": _clamp(0.35 + (spike_ratio * 0.65)),
@@ -181,8 +181,7 @@ class NewsIngestor(BaseIngestor):
                 }
             )
 
-        payloads.sort(key=lambda p: _sort_timestamp(p.get("timestamp")), reverse=True)
-        return payloads[: max(limit, 0)]
+        return _newest_payloads(payloads, limit)
 
     def _configured_feeds(self) -> list[str]:
         env_feeds = _split_csv(os.getenv("NEWS_AGENT_NEWS_FEEDS"))
@@ -208,27 +207,27 @@ class SocialIngestor(BaseIngestor):
             return []
 
         entries_by_term: list[tuple[str, FeedEntry]] = []
-        for term in tracked_terms:
-            query = quote_plus(f"{term} crypto")
-            feed_url = self.search_template.format(query=query)
-            try:
-                xml_text = self.http_get(feed_url)
-            except OSError:
+        term_counts: dict[str, int] = {}
+        feed_urls = [self.search_template.format(query=quote_plus(f"{term} crypto")) for term in tracked_terms]
+        for term, feed_url, xml_text in zip(tracked_terms, feed_urls, _fetch_texts(self.http_get, feed_urls)):
+            if xml_text is None:
                 continue
 
-            for entry in parse_feed_entries(xml_text, feed_url):
-                entries_by_term.append((term, entry))
+            entries = parse_feed_entries(xml_text, feed_url)
+            if entries:
+                term_counts[term] = term_counts.get(term, 0) + len(entries)
+                entries_by_term.extend((term, entry) for entry in entries)
 
         if not entries_by_term:
             return []
 
-        term_counts = Counter(term for term, _ in entries_by_term)
         peak_term_count = max(term_counts.values(), default=1)
         now_iso = utcnow().isoformat()
 
         payloads: list[dict] = []
         for term, entry in entries_by_term:
             text = f"{entry.title} {entry.summary}".strip()
+            lowered = text.lower()
             term_ratio = term_counts[term] / peak_term_count
             payloads.append(
                 {
@@ -236,8 +235,8 @@ class SocialIngestor(BaseIngestor):
                     "text": entry.title,
                     "summary": entry.title,
                     "entities": extract_entities(text),
-                    "sentiment_score": _sentiment_from_text(text),
-                    "magnitude_score": _magnitude_from_text(text, base=0.4 + (term_ratio * 0.2)),
+                    "sentiment_score": _sentiment_from_text(lowered),
+                    "magnitude_score": _magnitude_from_text(lowered, base=0.4 + (term_ratio * 0.2)),
                     "source_credibility": SOCIAL_SOURCE_CREDIBILITY.get(entry.source, 0.5),
                     "engagement_score": _clamp(0.4 + (term_ratio * 0.5)),
                     "velocity_change": _clamp(0.45 + (term_ratio * 0.55)),
@@ -245,8 +244,7 @@ class SocialIngestor(BaseIngestor):
                 }
             )
 
-        payloads.sort(key=lambda p: _sort_timestamp(p.get("timestamp")), reverse=True)
-        return payloads[: max(limit, 0)]
+        return _newest_payloads(payloads, limit)
 
 
 class HyperliquidIngestor(BaseIngestor):
@@ -270,26 +268,71 @@ class HyperliquidIngestor(BaseIngestor):
         per_wallet_fill_limit = max(5, min(250, max(limit, 1) * 4))
         per_wallet_trade_events = max(2, min(20, limit // max(len(wallets), 1)))
 
-        for wallet in wallets:
-            fills = self.client.user_fills(wallet, limit=per_wallet_fill_limit)
-            state = self.client.clearinghouse_state(wallet)
-            positions = normalize_positions(wallet, state)
-            trades, performance = aggregate_trade_history(wallet, fills)
-
-            open_orders = self.client.frontend_open_orders(wallet)
-            if not open_orders:
-                open_orders = self.client.open_orders(wallet)
-            open_order_count = len(open_orders)
-
-            payloads.extend(_hyperliquid_position_payloads(positions, open_order_count))
-            payloads.extend(_hyperliquid_trade_payloads(trades, per_wallet_trade_events))
-
-            summary_payload = _hyperliquid_performance_payload(performance, positions, open_order_count)
-            if summary_payload:
-                payloads.append(summary_payload)
-
-        payloads.sort(key=lambda p: _sort_timestamp(p.get("timestamp")), reverse=True)
-        return payloads[: max(limit, 0)]
+        # Each wallet needs three independent info queries; issue them all up front
+        # and consume results in wallet order so the output stays deterministic.
+        max_workers = min(len(wallets) * 3, HYPERLIQUID_MAX_CONCURRENT_REQUESTS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            queries = [
+                (
+                    wallet,
+                    executor.submit(self.client.user_fills, wallet, limit=per_wallet_fill_limit),
+                    executor.submit(self.client.clearinghouse_state, wallet),
+                    executor.submit(self._open_orders, wallet),
+                )
+                for wallet in wallets
+            ]
+            for wallet, fills, state, open_orders in queries:
+                payloads.extend(
+                    self._wallet_payloads(
+                        wallet,
+                        fills.result(),
+                        state.result(),
+                        len(open_orders.result()),
+                        per_wallet_trade_events,
+                    )
+                )
+
+        return _newest_payloads(payloads, limit)
+
+    def _open_orders(self, wallet: str) -> list[dict]:
+        open_orders = self.client.frontend_open_orders(wallet)
+        if not open_orders:
+            open_orders = self.client.open_orders(wallet)
+        return open_orders
+
+    def _wallet_payloads(
+        self,
+        wallet: str,
+        fills: list[dict],
+        state: dict,
+        open_order_count: int,
+        trade_events: int,
+    ) -> list[dict]:
+        positions = normalize_positions(wallet, state)
+        trades, performance = aggregate_trade_history(wallet, fills)
+
+        payloads = _hyperliquid_position_payloads(positions, open_order_count)
+        payloads.extend(_hyperliquid_trade_payloads(trades, trade_events))
+
+        summary_payload = _hyperliquid_performance_payload(performance, positions, open_order_count)
+        if summary_payload:
+            payloads.append(summary_payload)
+        return payloads
+
+
+def _fetch_texts(http_get: TextGetter, urls: Sequence[str]) -> list[str | None]:
+    # Each URL is an independent round trip; fetch concurrently but keep URL order.
+    # A failed fetch yields None so callers skip it as they did in the serial loop.
+    def fetch(url: str) -> str | None:
+        try:
+            return http_get(url)
+        except OSError:
+            return None
+
+    if len(urls) <= 1:
+        return [fetch(url) for url in urls]
+    with ThreadPoolExecutor(max_workers=min(len(urls), FEED_FETCH_MAX_WORKERS)) as executor:
+        return list(executor.map(fetch, urls))
 
 
 def _wallets_for_profile(user_profile: UserProfile) -> list[str]:
@@ -302,7 +345,8 @@ def _wallets_for_profile(user_profile: UserProfile) -> list[str]:
 def _hyperliquid_wallets_for_profile(user_profile: UserProfile) -> list[str]:
     env_wallets = _split_csv(os.getenv("NEWS_AGENT_HYPERLIQUID_WALLETS"))
     if env_wallets:
-        return env_wallets
+        # A wallet listed twice would otherwise issue its info queries twice.
+        return list(dict.fromkeys(env_wallets))
     configured = sorted(user_profile.hyperliquid_wallets)
     if configured:
         return configured
@@ -324,32 +368,30 @@ def _social_terms(user_profile: UserProfile) -> list[str]:
     return terms[:max_terms]
 
 
-def _token_mentions(entries: list[FeedEntry], watchlist: set[str]) -> Counter[str]:
-    mentions: Counter[str] = Counter()
+def _token_mentions(texts: list[str], watchlist: set[str]) -> dict[str, int]:
+    mentions: dict[str, int] = {}
     tracked = {token.upper() for token in watchlist}
     if not tracked:
         return mentions
 
-    for entry in entries:
-        text = f"{entry.title} {entry.summary}".upper()
+    for text in texts:
+        upper = text.upper()
         for token in tracked:
-            if token in text:
-                mentions[token] += 1
+            if token in upper:
+                mentions[token] = mentions.get(token, 0) + 1
     return mentions
 
 
-def _tx_to_payload(wallet: str, tx: dict) -> dict | None:
+def _tx_to_payload(wallet: str, wallet_lower: str, short_wallet: str, tx: dict) -> dict | None:
     value_wei = _safe_int(tx.get("value"))
     if value_wei <= 0:
         return None
 
-    wallet_lower = wallet.lower()
     from_address = str(tx.get("from", ""))
     to_address = str(tx.get("to", ""))
     tx_hash = str(tx.get("hash", ""))
     direction = "outflow" if from_address.lower() == wallet_lower else "inflow"
     value_eth = value_wei / 1_000_000_000_000_000_000
-    short_wallet = f"{wallet[:6]}...{wallet[-4:]}" if len(wallet) > 10 else wallet
     short_counterparty = f"{to_address[:6]}...{to_address[-4:]}" if len(to_address) > 10 else to_address
 
     summary = f"Tracked wallet {short_wallet} {direction} {value_eth:.2f} ETH"
@@ -406,7 +448,7 @@ def _hyperliquid_trade_payloads(trades: list[HyperliquidTrade], limit: int) -> l
     if not trades:
         return []
 
-    selected = sorted(trades, key=lambda trade: trade.timestamp, reverse=True)[: max(limit, 0)]
+    selected = heapq.nlargest(max(limit, 0), trades, key=_trade_timestamp)
     payloads: list[dict] = []
     for trade in selected:
         sentiment = 0.25 if trade.realized_pnl > 0 else -0.25 if trade.realized_pnl < 0 else 0.0
@@ -493,6 +535,15 @@ def _hyperliquid_magnitude(abs_pnl: float, size: float) -> float:
     return _clamp(0.35 + pnl_component + size_component)
 
 
+def _newest_payloads(payloads: list[dict], limit: int) -> list[dict]:
+    # nlargest matches a stable reverse sort plus slice, but only keeps `limit` items in its heap.
+    return heapq.nlargest(max(limit, 0), payloads, key=_payload_sort_key)
+
+
+def _payload_sort_key(payload: dict) -> object:
+    return _sort_timestamp(payload.get("timestamp"))
+
+
 def _sort_timestamp(value: object) -> object:
     try:
         return parse_timestamp(value)
@@ -515,8 +566,7 @@ def _news_source_credibility(source: str) -> float:
     return 0.68
 
 
-def _magnitude_from_text(text: str, base: float) -> float:
-    lowered = text.lower()
+def _magnitude_from_text(lowered: str, base: float) -> float:
     score = base
     for keyword, weight in IMPACT_KEYWORDS.items():
         if keyword in lowered:
@@ -524,8 +574,7 @@ def _magnitude_from_text(text: str, base: float) -> float:
     return _clamp(score)
 
 
-def _sentiment_from_text(text: str) -> float:
-    lowered = text.lower()
+def _sentiment_from_text(lowered: str) -> float:
     positive_hits = sum(1 for term in POSITIVE_SENTIMENT_TERMS if term in lowered)
     negative_hits = sum(1 for term in NEGATIVE_SENTIMENT_TERMS if term in lowered)
     if positive_hits == negative_hits:
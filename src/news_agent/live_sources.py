@@ -8,7 +8,6 @@ from urllib.request import Request, urlopen
 import xml.etree.ElementTree as ET
 
 HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
-WHITESPACE_PATTERN = re.compile(r"\s+")
 
 DEFAULT_USER_AGENT = "news-agent/0.1 (+https://example.com/news-agent)"
 DEFAULT_TIMEOUT_SECONDS = 12.0
@@ -157,6 +156,6 @@ def _tag_name(tag: str) -> str:
 
 
 def _clean_text(text: str) -> str:
-    stripped = HTML_TAG_PATTERN.sub(" ", text)
-    unescaped = unescape(stripped)
-    return WHITESPACE_PATTERN.sub(" ", unescaped).strip()
+    if "<" in text:
+        text = HTML_TAG_PATTERN.sub(" ", text)
+    return " ".join(unescape(text).split())
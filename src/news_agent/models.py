@@ -15,6 +15,8 @@ class Event:
     sentiment_score: float
     magnitude_score: float
     source_credibility: float = 0.5
+    velocity_change: float = 0.5
+    engagement_score: float = 0.5
     duplicate_key: str = ""
 
 
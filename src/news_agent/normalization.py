@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
+from functools import lru_cache
 import hashlib
 import re
 from typing import Any
@@ -21,29 +22,39 @@ def parse_timestamp(value: Any) -> datetime:
             numeric = numeric / 1000
         return datetime.fromtimestamp(numeric, tz=timezone.utc)
     if isinstance(value, str):
-        clean = value.strip()
-        if clean.isdigit():
-            numeric = int(clean)
-            if numeric > 10_000_000_000:
-                return datetime.fromtimestamp(numeric / 1000, tz=timezone.utc)
-            return datetime.fromtimestamp(numeric, tz=timezone.utc)
-
-        iso_candidate = clean.replace("Z", "+00:00")
-        try:
-            return datetime.fromisoformat(iso_candidate).astimezone(timezone.utc)
-        except ValueError:
-            parsed = parsedate_to_datetime(clean)
-            if parsed.tzinfo is None:
-                parsed = parsed.replace(tzinfo=timezone.utc)
-            return parsed.astimezone(timezone.utc)
+        return _parse_timestamp_text(value)
     raise ValueError("Unsupported timestamp format")
 
 
+@lru_cache(maxsize=4096)
+def _parse_timestamp_text(value: str) -> datetime:
+    clean = value.strip()
+    if clean.isdigit():
+        numeric = int(clean)
+        if numeric > 10_000_000_000:
+            return datetime.fromtimestamp(numeric / 1000, tz=timezone.utc)
+        return datetime.fromtimestamp(numeric, tz=timezone.utc)
+
+    iso_candidate = clean.replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(iso_candidate).astimezone(timezone.utc)
+    except ValueError:
+        parsed = parsedate_to_datetime(clean)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc)
+
+
 def extract_entities(text: str) -> list[str]:
+    return list(_entities_for_text(text))
+
+
+# Syndicated feeds repeat headlines across sources; callers get a fresh list per call.
+@lru_cache(maxsize=2048)
+def _entities_for_text(text: str) -> tuple[str, ...]:
     tokens = TOKEN_PATTERN.findall(text.upper())
     wallets = WALLET_PATTERN.findall(text)
-    entities = sorted({*tokens, *wallets})
-    return entities
+    return tuple(sorted({*tokens, *wallets}))
 
 
 def duplicate_key(source_type: str, summary: str, entities: list[str]) -> str:
@@ -63,6 +74,8 @@ def normalize_event(source_type: str, payload: dict[str, Any]) -> Event:
         sentiment_score=float(payload.get("sentiment_score", 0.0)),
         magnitude_score=float(payload.get("magnitude_score", 0.5)),
         source_credibility=float(payload.get("source_credibility", 0.5)),
+        velocity_change=float(payload.get("velocity_change", 0.5)),
+        engagement_score=float(payload.get("engagement_score", 0.5)),
     )
     event.duplicate_key = duplicate_key(source_type, event.summary, event.entities)
     return event
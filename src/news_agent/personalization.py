@@ -1,25 +1,24 @@
 from __future__ import annotations
 
-from collections import defaultdict
-
 
 class PersonalizationModel:
     """Lightweight feedback loop for category weighting."""
 
     def __init__(self) -> None:
-        self._engaged: dict[str, int] = defaultdict(int)
-        self._dismissed: dict[str, int] = defaultdict(int)
+        self._engaged: dict[str, int] = {}
+        self._dismissed: dict[str, int] = {}
 
     def record_engagement(self, category: str) -> None:
-        self._engaged[category] += 1
+        self._engaged[category] = self._engaged.get(category, 0) + 1
 
     def record_dismissal(self, category: str) -> None:
-        self._dismissed[category] += 1
+        self._dismissed[category] = self._dismissed.get(category, 0) + 1
 
     def weight_for(self, category: str) -> float:
-        engaged = self._engaged[category]
-        dismissed = self._dismissed[category]
-        if engaged == 0 and dismissed == 0:
+        engaged = self._engaged.get(category, 0)
+        dismissed = self._dismissed.get(category, 0)
+        total = engaged + dismissed
+        if not total:
             return 1.0
-        raw = 1 + ((engaged - dismissed) / max(engaged + dismissed, 1)) * 0.5
+        raw = 1 + ((engaged - dismissed) / total) * 0.5
         return max(0.6, min(1.4, raw))
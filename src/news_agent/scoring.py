@@ -17,28 +17,34 @@ def calculate_urgency(event: Event, now: datetime | None = None) -> float:
     now = now or datetime.now(timezone.utc)
     age_minutes = max((now - event.timestamp).total_seconds() / 60, 0)
     recency = _clamp(1 - (age_minutes / 180))
-    velocity = _clamp(float(event.raw_data.get("velocity_change", 0.5)))
+    velocity = _clamp(event.velocity_change)
     return _clamp((recency * 0.7) + (velocity * 0.3))
 
 
 def calculate_personal_relevance(event: Event, user: UserProfile, category_weight: float = 1.0) -> float:
-    entities = set(event.entities)
-    token_overlap = 1.0 if entities.intersection(user.token_watchlist) else 0.2
-    tracked_wallets = set(user.whale_wallets) | set(user.hyperliquid_wallets)
-    wallet_overlap = 1.0 if entities.intersection(tracked_wallets) else 0.2
+    entities = event.entities
+    token_overlap = 0.2 if user.token_watchlist.isdisjoint(entities) else 1.0
+    tracked_wallet = not (user.whale_wallets.isdisjoint(entities) and user.hyperliquid_wallets.isdisjoint(entities))
+    wallet_overlap = 1.0 if tracked_wallet else 0.2
     base = (token_overlap * 0.6) + (wallet_overlap * 0.4)
     return _clamp(base * category_weight)
 
 
 def calculate_noise(event: Event, duplicate_penalty: float = 0.0) -> float:
-    low_engagement = _clamp(1 - float(event.raw_data.get("engagement_score", 0.5)))
+    low_engagement = _clamp(1 - event.engagement_score)
     noise = 0.3 + (low_engagement * 0.5) + duplicate_penalty
     return _clamp(noise, 0.1, 1.0)
 
 
-def build_signal(event: Event, user: UserProfile, category_weight: float = 1.0, duplicate_penalty: float = 0.0) -> Signal:
+def build_signal(
+    event: Event,
+    user: UserProfile,
+    category_weight: float = 1.0,
+    duplicate_penalty: float = 0.0,
+    now: datetime | None = None,
+) -> Signal:
     impact = calculate_impact(event)
-    urgency = calculate_urgency(event)
+    urgency = calculate_urgency(event, now)
     relevance = calculate_personal_relevance(event, user, category_weight)
     noise = calculate_noise(event, duplicate_penalty)
     score = _clamp((impact * urgency * relevance) / max(noise, 0.1))
@@ -47,3 +47,22 @@ def test_deduplicate_removes_identical_items() -> None:
 
     signals, _ = engine.run_cycle(streams)
     assert len(signals) == 1
+
+
+def test_collect_live_streams_returns_every_ingestor_payload() -> None:
+    profile = UserProfile(token_watchlist={"BTC"}, whale_wallets=set(), alert_threshold=0.5)
+    engine = IntelligenceEngine(profile)
+
+    class _StubIngestor:
+        def __init__(self, source_type: str) -> None:
+            self.source_type = source_type
+
+        def fetch_latest(self, user: UserProfile, limit: int) -> list[dict]:
+            return [{"summary": f"{self.source_type} update", "limit": limit}]
+
+    engine.ingestors = {source_type: _StubIngestor(source_type) for source_type in engine.ingestors}
+
+    streams = engine.collect_live_streams(limit_per_source=3)
+
+    assert list(streams) == list(engine.ingestors)
+    assert streams["news"] == [{"summary": "news update", "limit": 3}]
@@ -0,0 +1,25 @@
+import os
+
+from news_agent.env import load_dotenv
+
+
+def test_load_dotenv_parses_entries_and_keeps_existing_values(tmp_path, monkeypatch) -> None:
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "# comment\n"
+        "NEWS_AGENT_WATCHLIST = BTC,ETH \n"
+        "NEWS_AGENT_NEWS_FEEDS='https://example.com/rss?a=b'\n"
+        "not an assignment\n"
+        "NEWS_AGENT_ALERT_THRESHOLD=0.9\n",
+        encoding="utf-8",
+    )
+    environ = {"NEWS_AGENT_ALERT_THRESHOLD": "0.5"}
+    monkeypatch.setattr(os, "environ", environ)
+
+    load_dotenv(str(env_file))
+
+    assert environ == {
+        "NEWS_AGENT_WATCHLIST": "BTC,ETH",
+        "NEWS_AGENT_NEWS_FEEDS": "https://example.com/rss?a=b",
+        "NEWS_AGENT_ALERT_THRESHOLD": "0.5",
+    }
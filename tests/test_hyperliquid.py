@@ -1,7 +1,20 @@
+from http.client import HTTPMessage, RemoteDisconnected
+from urllib.request import Request
+
+import pytest
+
 from news_agent.export_hyperliquid_positions import wallets_from_env
-from news_agent.hyperliquid import aggregate_trade_history, normalize_positions, reconstruct_position_history
+from news_agent.hyperliquid import (
+    HyperliquidInfoClient,
+    _fill_sort_key,
+    _state_timestamp,
+    aggregate_trade_history,
+    normalize_positions,
+    reconstruct_position_history,
+)
 from news_agent.ingestion import HyperliquidIngestor
 from news_agent.models import UserProfile
+from news_agent.normalization import parse_timestamp
 
 
 def test_aggregate_trade_history_computes_realized_pnl() -> None:
@@ -131,3 +144,167 @@ def test_wallets_from_env_extracts_and_dedupes_addresses() -> None:
         "0x2222222222222222222222222222222222222222",
         "0x3333333333333333333333333333333333333333",
     ]
+
+
+def test_wallets_from_env_lowercases_mixed_case_duplicates() -> None:
+    raw = "0xABCDEFabcdef0000000000000000000000000000 0xabcdefABCDEF0000000000000000000000000000"
+
+    assert wallets_from_env(raw) == ["0xabcdefabcdef0000000000000000000000000000"]
+
+
+def test_hyperliquid_ingestor_queries_duplicated_env_wallets_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[dict] = []
+
+    def post_json(url: str, payload: dict, timeout_seconds: float) -> list:
+        calls.append(payload)
+        return []
+
+    monkeypatch.setenv("NEWS_AGENT_HYPERLIQUID_WALLETS", "0xaaa,0xaaa")
+    ingestor = HyperliquidIngestor(client=HyperliquidInfoClient(http_post_json=post_json))
+
+    ingestor.fetch_latest(UserProfile())
+
+    assert sorted(payload["type"] for payload in calls) == [
+        "clearinghouseState",
+        "frontendOpenOrders",
+        "openOrders",
+        "userFills",
+    ]
+
+
+def test_user_fills_timestamps_are_parsed_once_through_aggregation(monkeypatch: pytest.MonkeyPatch) -> None:
+    parsed: list[object] = []
+
+    def counting_parse(value: object) -> object:
+        parsed.append(value)
+        return parse_timestamp(value)
+
+    fills = _StubHyperliquidClient().user_fills("0xwallet")
+    client = HyperliquidInfoClient(http_post_json=lambda url, payload, timeout_seconds: fills)
+    monkeypatch.setattr("news_agent.hyperliquid.parse_timestamp", counting_parse)
+
+    trades, _ = aggregate_trade_history("0xwallet", client.user_fills("0xwallet"))
+
+    assert [trade.trade_id for trade in trades] == ["a1", "a2"]
+    assert len(parsed) == len(fills)
+
+
+def test_reconstruct_position_history_reads_hyperliquid_side_codes() -> None:
+    fills = [
+        {"coin": "BTC", "side": "B", "sz": "1.0", "px": "100", "fee": "0", "time": "2026-02-14T10:00:00Z", "tid": "1"},
+        {"coin": "BTC", "side": "A", "sz": "1.0", "px": "120", "fee": "0", "time": "2026-02-14T10:01:00Z", "tid": "2"},
+    ]
+
+    rows = reconstruct_position_history("0xwallet", fills)
+
+    assert [row.fill_side for row in rows] == ["buy", "sell"]
+    assert rows[-1].position_side == "flat"
+    assert rows[-1].realized_pnl == 20.0
+
+
+class _FakeResponse:
+    def __init__(self, status: int, body: bytes) -> None:
+        self.status = status
+        self.headers = HTTPMessage()
+        self._body = body
+
+    def read(self) -> bytes:
+        return self._body
+
+
+class _FakeConnection:
+    def __init__(self, netloc: str, timeout: float, status: int) -> None:
+        self.netloc = netloc
+        self.status = status
+        self.requests = 0
+        self.drop_next = False
+        self.closed = False
+
+    def request(self, method: str, path: str, body: bytes | None = None, headers: dict | None = None) -> None:
+        if self.drop_next:
+            self.drop_next = False
+            raise RemoteDisconnected("Remote end closed connection without response")
+        self.requests += 1
+
+    def getresponse(self) -> _FakeResponse:
+        return _FakeResponse(self.status, b'{"assetPositions": []}')
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _patch_connections(monkeypatch: pytest.MonkeyPatch, status: int = 200) -> list[_FakeConnection]:
+    connections: list[_FakeConnection] = []
+
+    def connect(netloc: str, timeout: float) -> _FakeConnection:
+        connection = _FakeConnection(netloc, timeout, status)
+        connections.append(connection)
+        return connection
+
+    monkeypatch.setattr("news_agent.hyperliquid.HTTPSConnection", connect)
+    return connections
+
+
+def test_info_client_reuses_connection_and_retries_dropped_socket(monkeypatch: pytest.MonkeyPatch) -> None:
+    connections = _patch_connections(monkeypatch)
+    client = HyperliquidInfoClient()
+
+    client.clearinghouse_state("0xwallet")
+    client.user_fills("0xwallet")
+    assert len(connections) == 1
+    assert connections[0].requests == 2
+
+    connections[0].drop_next = True
+    assert client.clearinghouse_state("0xwallet") == {"assetPositions": []}
+    assert len(connections) == 2
+    assert connections[0].closed
+    assert connections[1].requests == 1
+
+    client.close()
+    assert connections[1].closed
+
+
+def test_info_client_raises_os_error_for_http_error_status(monkeypatch: pytest.MonkeyPatch) -> None:
+    _patch_connections(monkeypatch, status=429)
+    client = HyperliquidInfoClient()
+
+    with pytest.raises(OSError, match="HTTP 429"):
+        client.http_post_json(client.info_url, {"type": "clearinghouseState", "user": "0xwallet"}, 1.0)
+    assert client.clearinghouse_state("0xwallet") == {}
+
+
+class _FakeUrlopenResponse(_FakeResponse):
+    def __init__(self, body: bytes) -> None:
+        super().__init__(200, body)
+
+    def __enter__(self) -> "_FakeUrlopenResponse":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+def test_info_client_posts_through_urlopen_when_a_proxy_applies(monkeypatch: pytest.MonkeyPatch) -> None:
+    connections = _patch_connections(monkeypatch)
+    opened: list[str] = []
+
+    def fake_urlopen(request: Request, timeout: float) -> _FakeUrlopenResponse:
+        opened.append(request.full_url)
+        return _FakeUrlopenResponse(b'{"assetPositions": []}')
+
+    monkeypatch.setattr("news_agent.hyperliquid.getproxies", lambda: {"https": "http://proxy.internal:3128"})
+    monkeypatch.setattr("news_agent.hyperliquid.proxy_bypass", lambda host: False)
+    monkeypatch.setattr("news_agent.hyperliquid.urlopen", fake_urlopen)
+    client = HyperliquidInfoClient()
+
+    assert client.clearinghouse_state("0xwallet") == {"assetPositions": []}
+    assert opened == [client.info_url]
+    assert connections == []
+
+
+
+def test_fill_sort_key_numeric_time_matches_parse_timestamp() -> None:
+    for value in (1_700_000_000_123, 1_700_000_000, 1_700_000_000.5):
+        assert _fill_sort_key({"time": value}) == parse_timestamp(value)
+        assert _state_timestamp({"time": value}) == parse_timestamp(value)
+    assert _fill_sort_key({"time": "2024-01-02T03:04:05Z"}) == parse_timestamp("2024-01-02T03:04:05Z")
@@ -46,3 +46,26 @@ def test_social_ingestor_uses_watchlist_queries(monkeypatch) -> None:
     assert payloads
     assert payloads[0]["source_links"]
     assert payloads[0]["source_credibility"] > 0
+
+
+def test_news_ingestor_keeps_feed_order_and_skips_failed_feeds(monkeypatch) -> None:
+    monkeypatch.delenv("NEWS_AGENT_NEWS_FEEDS", raising=False)
+    feeds = ["https://one.example.com/feed", "https://down.example.com/feed", "https://two.example.com/feed"]
+
+    def http_get(url: str) -> str:
+        if "down" in url:
+            raise OSError("unreachable")
+        host = url.split("/")[2]
+        return SAMPLE_RSS.replace("https://example.com/news/", f"https://{host}/news/")
+
+    ingestor = NewsIngestor(feed_urls=feeds, http_get=http_get)
+    user = UserProfile(token_watchlist={"BTC", "ETH"}, whale_wallets=set(), alert_threshold=0.5)
+
+    payloads = ingestor.fetch_latest(user, limit=10)
+
+    assert [p["source_links"][0] for p in payloads] == [
+        "https://one.example.com/news/btc-etf",
+        "https://two.example.com/news/btc-etf",
+        "https://one.example.com/news/eth-dev",
+        "https://two.example.com/news/eth-dev",
+    ]